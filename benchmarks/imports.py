@@ -0,0 +1,106 @@
+"""Measure the import time of the Anglian Water integration modules.
+
+Each module is imported in a fresh interpreter with ``-X importtime``
+after Home Assistant core has been imported, so the numbers only cover
+what the integration adds. For every module the cumulative import time is
+reported, together with whether pyanglianwater and the recorder were
+pulled in.
+
+The first row is the package itself. Its ``__init__`` imports the library
+and most modules, so the other modules are imported under a stand-in for
+the package that skips ``__init__``, and each row only shows what that
+module adds.
+
+Run from the repository root:
+
+    python3 benchmarks/imports.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = "custom_components.anglian_water"
+MODULES = [
+    "",
+    ".const",
+    ".config_flow",
+    ".diagnostics",
+    ".coordinator",
+    ".statistics",
+    ".sensor",
+    ".binary_sensor",
+]
+# Imported before measuring, Home Assistant has these loaded already.
+BASELINE = (
+    "import homeassistant.core, homeassistant.config_entries, "
+    "homeassistant.helpers.update_coordinator, homeassistant.helpers.entity, "
+    "homeassistant.helpers.config_validation"
+)
+# Registers the package without running its __init__.
+STUB_PACKAGE = (
+    "import sys, types\n"
+    f"package = types.ModuleType({PACKAGE!r})\n"
+    f"package.__path__ = [{str(ROOT / PACKAGE.replace('.', '/'))!r}]\n"
+    f"sys.modules[{PACKAGE!r}] = package"
+)
+WATCHED = ["pyanglianwater", "homeassistant.components.recorder"]
+
+
+def measure(module: str) -> dict:
+    """Import one module and return its import time breakdown."""
+    setup = BASELINE if module == PACKAGE else f"{BASELINE}\n{STUB_PACKAGE}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{setup}\nimport {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = (part.strip() for part in line[12:].split("|"))
+        if total.isdigit():
+            cumulative[name] = int(total)
+    return {
+        "module": module,
+        "import_ms": round(cumulative.get(module, 0) / 1000, 2),
+        **{
+            f"{watched}_ms": round(cumulative[watched] / 1000, 2)
+            if watched in cumulative else None
+            for watched in WATCHED
+        },
+    }
+
+
+def main() -> None:
+    """Measure every module and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    args = parser.parse_args()
+
+    results = [measure(f"{PACKAGE}{module}") for module in MODULES]
+    columns = list(results[0])
+    widths = {
+        column: max(len(column), *(len(str(result[column])) for result in results))
+        for column in columns
+    }
+    lines = ["  ".join(f"{column:>{widths[column]}}" for column in columns)]
+    lines.extend(
+        "  ".join(f"{result[column]!s:>{widths[column]}}" for column in columns)
+        for result in results
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
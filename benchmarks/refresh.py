@@ -0,0 +1,371 @@
+"""Offline benchmark of the Anglian Water integration.
+
+Sets up the integration in a throwaway Home Assistant instance against a
+local stand-in for the Anglian Water API and reports, for each history
+length, how long setup and refreshes take, how many statistics rows are
+imported, the peak Python memory and the state writes per refresh.
+
+Nothing leaves the machine: logins, tariffs, account details and usage
+payloads are all served by FakeAnglianWater below. The recorder is not
+loaded; statistics imports are counted instead of written.
+
+Requires the Home Assistant test helpers:
+
+    python3 -m pip install pytest-homeassistant-custom-component
+
+Run from the repository root:
+
+    scripts/benchmark --history 1000 10000 100000 500000 --accounts 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+try:
+    from pytest_homeassistant_custom_component.common import (
+        MockConfigEntry,
+        async_test_home_assistant,
+    )
+except ImportError:
+    sys.exit(
+        "The benchmark needs the Home Assistant test helpers, install them with "
+        "'python3 -m pip install pytest-homeassistant-custom-component'."
+    )
+
+from aiohttp import DummyCookieJar
+from homeassistant import loader
+from homeassistant.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from custom_components.anglian_water.cache import AnglianWaterCache
+from custom_components.anglian_water.const import (
+    CONF_ACCOUNT_ID,
+    CONF_AREA,
+    CONF_VERSION,
+    DOMAIN,
+)
+from custom_components.anglian_water.readings import HOUR, MeterReadings
+
+AREA = "Anglian"
+TARIFF = "Standard"
+TARIFF_CONFIG = {
+    "2024-25": {"rate": 2.0242, "service": 36.0},
+    "2025-26": {"rate": 2.1837, "service": 38.0},
+}
+# Hours of readings in each usage response, the rest is history.
+PAYLOAD_HOURS = 48
+
+
+def _consumption(timestamp: int) -> float:
+    """Return a repeatable synthetic consumption for an hour."""
+    hour = dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).hour
+    return float((timestamp // HOUR) % 7 + (30 if 6 <= hour <= 9 else 0))
+
+
+class FakeAnglianWater:
+    """Serve synthetic smart meter readings for one account."""
+
+    def __init__(self, account: int, meters: int, payload_hours: int) -> None:
+        """Initialize."""
+        # Unique IDs are serial based, every account needs its own meters.
+        self.serials = [f"BENCH{account:02d}{meter:06d}" for meter in range(meters)]
+        self.payload_hours = payload_hours
+        self.now = int(dt_util.utcnow().timestamp()) // HOUR * HOUR
+        self.requests = 0
+
+    def advance(self, hours: int = 1) -> None:
+        """Publish the readings of the next hours."""
+        self.now += hours * HOUR
+
+    def history(self, hours: int) -> MeterReadings:
+        """Return the readings of the hours before the current payload."""
+        readings = MeterReadings()
+        read = 0.0
+        for timestamp in range(
+            self.now - (hours + self.payload_hours) * HOUR,
+            self.now - self.payload_hours * HOUR,
+            HOUR,
+        ):
+            consumption = _consumption(timestamp)
+            read += consumption / 1000
+            readings._put(timestamp, consumption, read)
+        return readings
+
+    def usage(self, reads: dict[str, float]) -> dict:
+        """Return a usage response for the current payload window."""
+        records = []
+        for timestamp in range(
+            self.now - self.payload_hours * HOUR + HOUR, self.now + HOUR, HOUR
+        ):
+            read_at = dt_util.as_local(
+                dt_util.utc_from_timestamp(timestamp)
+            ).isoformat()
+            meters = []
+            for serial in self.serials:
+                consumption = _consumption(timestamp)
+                reads[serial] = reads.get(serial, 0.0) + consumption / 1000
+                meters.append({
+                    "meter_serial_number": serial,
+                    "read_at": read_at,
+                    "consumption": consumption,
+                    "read": round(reads[serial], 3),
+                })
+            records.append({"meters": meters})
+        return {"result": {"records": records}}
+
+
+ACCOUNTS: dict[str, FakeAnglianWater] = {}
+
+
+class FakeSession:
+    """Stand in for the account ClientSession, FakeAuth sends no requests."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.cookie_jar = DummyCookieJar()
+
+    async def close(self) -> None:
+        """Close the session."""
+        self.closed = True
+
+
+class FakeAuth:
+    """Stand in for AnglianWaterAuth, answering from FakeAnglianWater."""
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        refresh_token: str | None = None,
+        session=None,
+        account_number: str | None = None,
+    ) -> None:
+        """Initialize."""
+        self.username = username
+        self.account_number = account_number
+        self._auth_session = session
+        self._refresh_token = refresh_token
+        self.auth_data = None
+        self.next_refresh: datetime | None = None
+        self.last_response_bytes: int | None = None
+
+    @property
+    def access_token(self) -> str | None:
+        """Return the access token."""
+        return None if self.auth_data is None else self.auth_data["access_token"]
+
+    @property
+    def refresh_token(self) -> str | None:
+        """Return the refresh token."""
+        return self._refresh_token
+
+    async def send_refresh_request(self) -> None:
+        """Issue a new token."""
+        if self.next_refresh is not None and self.next_refresh > datetime.now():
+            return
+        self.auth_data = {"access_token": "bench"}
+        self._refresh_token = "bench"
+        self.next_refresh = datetime.now() + timedelta(hours=1)
+
+    async def send_login_request(self) -> None:
+        """Log in."""
+        self.next_refresh = None
+        await self.send_refresh_request()
+
+    async def get_tariff_data(self) -> dict:
+        """Return the tariffs."""
+        return {AREA: {TARIFF: TARIFF_CONFIG}}
+
+    async def send_request(self, endpoint: str, body: dict, **kwargs) -> dict:
+        """Answer an API request."""
+        account = ACCOUNTS[self.username]
+        account.requests += 1
+        if endpoint == "get_account":
+            response = {"result": {"meter_type": "SmartMeter", "tariff": TARIFF}}
+        else:
+            # Reads restart from zero for each response, which is enough
+            # to exercise the pipeline.
+            response = account.usage({})
+        self.last_response_bytes = len(json.dumps(response))
+        return response
+
+
+async def _async_seed_cache(hass, entry, account: FakeAnglianWater, hours: int):
+    """Store a cache so setup restores the history from disk."""
+    readings = account.history(hours)
+    await AnglianWaterCache(hass, entry.entry_id)._store.async_save({
+        "account_config": {"meter_type": "SmartMeter", "tariff": TARIFF},
+        "tariff_config": TARIFF_CONFIG,
+        "current_tariff_area": AREA,
+        "meters": {serial: readings.as_dict() for serial in account.serials},
+        "polling_arrivals": [0.0] * 24,
+    })
+
+
+async def async_run(history: int, args: argparse.Namespace) -> dict:
+    """Benchmark one history length."""
+    imported_rows = 0
+    state_writes = 0
+
+    def _count_import(hass, metadata, statistics) -> None:
+        nonlocal imported_rows
+        imported_rows += len(statistics)
+
+    async def _no_watermark(self, statistic_id):
+        return None
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch("custom_components.anglian_water.AnglianWaterAuth", FakeAuth)
+        )
+        # A real session needs the network integration the test instance
+        # does not load.
+        stack.enter_context(patch(
+            "custom_components.anglian_water.session.async_create_clientsession",
+            lambda hass, **kwargs: FakeSession(),
+        ))
+        stack.enter_context(patch(
+            "homeassistant.components.recorder.statistics.async_import_statistics",
+            _count_import,
+        ))
+        # The benchmark refreshes far more often than the real rate budget.
+        stack.enter_context(patch(
+            "custom_components.anglian_water.scheduler.RATE_LIMIT", sys.maxsize
+        ))
+        stack.enter_context(patch(
+            "custom_components.anglian_water.statistics.MeterStatistics."
+            "_async_load_watermark",
+            _no_watermark,
+        ))
+        async with async_test_home_assistant() as hass:
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+            entries = []
+            for account in range(args.accounts):
+                username = f"bench{account}@example.com"
+                ACCOUNTS[username] = FakeAnglianWater(
+                    account, args.meters, PAYLOAD_HOURS
+                )
+                entry = MockConfigEntry(
+                    domain=DOMAIN,
+                    version=CONF_VERSION,
+                    title=username,
+                    data={
+                        CONF_USERNAME: username,
+                        CONF_PASSWORD: "bench",
+                        CONF_ACCESS_TOKEN: "bench",
+                        CONF_ACCOUNT_ID: f"{account:010d}",
+                        CONF_AREA: AREA,
+                    },
+                )
+                entry.add_to_hass(hass)
+                if history:
+                    await _async_seed_cache(
+                        hass, entry, ACCOUNTS[username], history
+                    )
+                entries.append(entry)
+
+            @callback
+            def _count_write(event) -> None:
+                nonlocal state_writes
+                state_writes += 1
+
+            hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            # Setting up one entry sets up the domain, and with it every entry.
+            await hass.config_entries.async_setup(entries[0].entry_id)
+            setup = time.perf_counter() - started
+            await hass.async_block_till_done()
+            ready = time.perf_counter() - started
+            setup_peak = tracemalloc.get_traced_memory()[1]
+
+            latencies = []
+            writes = []
+            imports = []
+            tracemalloc.reset_peak()
+            for _ in range(args.refreshes):
+                for account in ACCOUNTS.values():
+                    account.advance()
+                imported_rows = state_writes = 0
+                started = time.perf_counter()
+                for entry in entries:
+                    await hass.data[DOMAIN][entry.entry_id].async_refresh()
+                await hass.async_block_till_done()
+                latencies.append(time.perf_counter() - started)
+                writes.append(state_writes)
+                imports.append(imported_rows)
+            refresh_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            for entry in entries:
+                await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+            ACCOUNTS.clear()
+
+    return {
+        "history": history,
+        "accounts": args.accounts,
+        "meters": args.meters,
+        "setup_s": round(setup, 4),
+        "ready_s": round(ready, 4),
+        "setup_peak_mib": round(setup_peak / 2**20, 2),
+        "refresh_mean_s": round(statistics.fmean(latencies), 4),
+        "refresh_max_s": round(max(latencies), 4),
+        "refresh_peak_mib": round(refresh_peak / 2**20, 2),
+        "statistics_rows": round(statistics.fmean(imports), 1),
+        "state_writes": round(statistics.fmean(writes), 1),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--history",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="hours of cached history per meter, one run per value",
+    )
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--meters", type=int, default=1, help="meters per account")
+    parser.add_argument("--refreshes", type=int, default=10)
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    args = parser.parse_args()
+
+    results = [asyncio.run(async_run(history, args)) for history in args.history]
+    columns = list(results[0])
+    lines = ["  ".join(f"{column:>16}" for column in columns)]
+    lines.extend(
+        "  ".join(f"{result[column]!s:>16}" for column in columns)
+        for result in results
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
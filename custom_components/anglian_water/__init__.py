@@ -5,40 +5,218 @@ This integration is not endoursed or supported by Anglian Water.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from datetime import timedelta
 
-from aiohttp import CookieJar
-from homeassistant.config_entries import ConfigEntry
+from aiohttp import ClientError
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_ACCESS_TOKEN, Platform
-from homeassistant.core import (
-    HomeAssistant,
-    ServiceCall,
-    ServiceResponse,
-    SupportsResponse,
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryError,
+    ConfigEntryNotReady,
 )
-from homeassistant.exceptions import ConfigEntryNotReady, ConfigEntryAuthFailed
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
-from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers import device_registry as dr, issue_registry as ir
 from pyanglianwater import AnglianWater
+from pyanglianwater.api import API
 from pyanglianwater.auth import MSOB2CAuth
-from pyanglianwater.exceptions import ServiceUnavailableError, SmartMeterUnavailableError, ExpiredAccessTokenError
+from pyanglianwater.exceptions import (
+    AuthError,
+    ServiceUnavailableError,
+    SmartMeterUnavailableError,
+    ExpiredAccessTokenError,
+    TariffNotAvailableError,
+    UnknownEndpointError,
+)
 
 
 from .const import (
     DOMAIN,
     CONF_AREA,
     CONF_ACCOUNT_ID,
+    CONF_CONTINUOUS_FLOW_HOURS,
     CONF_CUSTOM_RATE,
-    CONF_VERSION
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_VERSION,
+    DATA_SCHEDULER,
+    DATA_TOKENS,
+    DEFAULT_CONTINUOUS_FLOW_HOURS,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    NAME,
 )
+from .cache import AnglianWaterCache
+from .circuit import CircuitOpenError
 from .coordinator import AnglianWaterDataUpdateCoordinator
+from .scheduler import AnglianWaterScheduler
+from .services import async_setup_services, async_unload_services
+from .session import AnglianWaterAuth, async_close_session, async_get_session
+from .token_manager import AnglianWaterTokenManager
 
 PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
     Platform.SENSOR,
 ]
 
 _LOGGER = logging.getLogger(__name__)
 
+# Delay before retrying a background connect that failed on the network,
+# doubled on each attempt.
+CONNECT_RETRY_INTERVAL = timedelta(minutes=1)
+CONNECT_RETRY_MAX_INTERVAL = timedelta(minutes=30)
+
+
+def _async_get_token_manager(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> AnglianWaterTokenManager:
+    """Return the token manager of an entry, reusing it across reloads."""
+    credentials = (
+        entry.data[CONF_USERNAME],
+        entry.data[CONF_PASSWORD],
+        entry.data.get(CONF_ACCOUNT_ID, None),
+    )
+    managers: dict[str, AnglianWaterTokenManager] = hass.data.setdefault(
+        DATA_TOKENS, {}
+    )
+    manager = managers.get(entry.entry_id)
+    if manager is None or manager.credentials != credentials:
+        manager = managers[entry.entry_id] = AnglianWaterTokenManager(
+            hass,
+            AnglianWaterAuth(
+                username=entry.data[CONF_USERNAME],
+                password=entry.data[CONF_PASSWORD],
+                refresh_token=entry.data.get(CONF_ACCESS_TOKEN, None),
+                session=async_get_session(hass, entry.data[CONF_USERNAME]),
+                account_number=entry.data.get(CONF_ACCOUNT_ID, None),
+            ),
+            credentials,
+        )
+    return manager
+
+
+async def _async_create_client(entry: ConfigEntry, api: MSOB2CAuth) -> AnglianWater:
+    """Load the account and tariff from Anglian Water."""
+    client = await AnglianWater.create_from_authenticator(
+        authenticator=api,
+        area=entry.data.get(CONF_AREA, None),
+        custom_rate=entry.data.get(CONF_CUSTOM_RATE, None)
+    )
+    # The library declares meters on the class, keep them per account.
+    client.meters = {}
+    return client
+
+
+@callback
+def _async_register_account_device(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Register the account device the meter devices are connected through.
+
+    Before meters had their own devices the account identifier was used for
+    the meter device, so the meter fields are cleared here.
+    """
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=entry.title,
+        manufacturer=NAME,
+        model=None,
+        serial_number=None,
+        entry_type=dr.DeviceEntryType.SERVICE,
+    )
+
+
+def _entry_settings(entry: ConfigEntry) -> tuple[dict, dict]:
+    """Return the entry data and options a reload would pick up.
+
+    The refresh token is left out, the token manager stores it on the
+    entry as it changes and already holds the new one.
+    """
+    return (
+        {key: value for key, value in entry.data.items() if key != CONF_ACCESS_TOKEN},
+        dict(entry.options),
+    )
+
+
+@callback
+def _async_check_meter_owners(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: AnglianWaterDataUpdateCoordinator,
+) -> None:
+    """Fail setup if another loaded entry already provides one of the meters."""
+    for entry_id, other in hass.data[DOMAIN].items():
+        if entry_id == entry.entry_id:
+            continue
+        for serial_number in coordinator.client.meters:
+            if serial_number in other.client.meters:
+                hass.data[DOMAIN].pop(entry.entry_id)
+                raise ConfigEntryError(
+                    translation_domain=DOMAIN,
+                    translation_key="meter_already_configured",
+                    translation_placeholders={
+                        "meter": serial_number,
+                        "entry": other.config_entry.title,
+                    },
+                )
+
+
+async def _async_connect_cached(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    tokens: AnglianWaterTokenManager,
+    coordinator: AnglianWaterDataUpdateCoordinator,
+) -> None:
+    """Log in and refresh an entry that was set up from the cache.
+
+    Runs as a background task of the entry, so it is cancelled when the
+    entry unloads.
+    """
+    delay = CONNECT_RETRY_INTERVAL
+    while True:
+        try:
+            async with coordinator.scheduler.async_slot():
+                await tokens.async_ensure_token()
+                client = await _async_create_client(entry, tokens.auth)
+        except (CircuitOpenError, ServiceUnavailableError):
+            # The circuit breaker raised the maintenance issue, the coordinator
+            # retries once it closes.
+            return
+        except SmartMeterUnavailableError:
+            _LOGGER.warning("No smart meter was found for this account")
+            return
+        except AuthError:
+            entry.async_start_reauth(hass)
+            return
+        except TariffNotAvailableError as exception:
+            _LOGGER.warning(
+                "Unable to load the Anglian Water tariff, using the cached one: %s",
+                exception,
+            )
+            await coordinator.async_refresh()
+            return
+        except (ClientError, TimeoutError, UnknownEndpointError) as exception:
+            _LOGGER.warning(
+                "Unable to connect to Anglian Water, retrying in %s: %s",
+                delay,
+                exception,
+            )
+            await asyncio.sleep(delay.total_seconds())
+            if (
+                entry.state is not ConfigEntryState.LOADED
+                or hass.data[DOMAIN].get(entry.entry_id) is not coordinator
+            ):
+                return
+            delay = min(delay * 2, CONNECT_RETRY_MAX_INTERVAL)
+            continue
+        break
+    coordinator.client.account_config = client.account_config
+    coordinator.client.tariff_config = client.tariff_config
+    coordinator.client.current_tariff_area = client.current_tariff_area
+    coordinator.update_tariff()
+    await coordinator.async_refresh()
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
@@ -47,64 +225,69 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if entry.version < CONF_VERSION:
         return False
     try:
-        _api = MSOB2CAuth(
-            username=entry.data[CONF_USERNAME],
-            password=entry.data[CONF_PASSWORD],
-            refresh_token=entry.data.get(CONF_ACCESS_TOKEN, None),
-            session=async_create_clientsession(
-                hass,
-                cookie_jar=CookieJar(quote_cookie=False)),
-            account_number=entry.data.get(CONF_ACCOUNT_ID, None),
-        )
-        await _api.send_login_request()
-        _aw = await AnglianWater.create_from_authenticator(
-            authenticator=_api,
-            area=entry.data.get(CONF_AREA, None),
-            custom_rate=entry.data.get(CONF_CUSTOM_RATE, None)
+        tokens = _async_get_token_manager(hass, entry)
+        tokens.async_start(entry)
+        entry.async_on_unload(tokens.async_stop)
+        _api = tokens.auth
+        scheduler: AnglianWaterScheduler = hass.data.setdefault(
+            DATA_SCHEDULER, AnglianWaterScheduler(hass)
         )
+        entry.async_on_unload(scheduler.async_register(entry.entry_id))
+        cache = AnglianWaterCache(hass, entry.entry_id)
+        if cached := await cache.async_load():
+            # Come up from the last known state and go to the network in
+            # the background, so setup does not wait on Anglian Water.
+            _aw = cache.restore_client(
+                API(_api), entry.data.get(CONF_CUSTOM_RATE, None)
+            )
+        else:
+            async with scheduler.async_slot():
+                await tokens.async_ensure_token()
+                _aw = await _async_create_client(entry, _api)
         hass.data.setdefault(DOMAIN, {})
         hass.data[DOMAIN][entry.entry_id] = coordinator = (
-            AnglianWaterDataUpdateCoordinator(hass=hass, client=_aw)
-        )
-        hass.config_entries.async_update_entry(
-            entry,
-            data={
-                **entry.data,
-                CONF_ACCESS_TOKEN: _api.refresh_token
-            }
+            AnglianWaterDataUpdateCoordinator(
+                hass=hass,
+                client=_aw,
+                cache=cache,
+                tokens=tokens,
+                scheduler=scheduler,
+                min_interval=timedelta(minutes=entry.options.get(
+                    CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)),
+                max_interval=timedelta(minutes=entry.options.get(
+                    CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)),
+                continuous_flow_hours=int(entry.options.get(
+                    CONF_CONTINUOUS_FLOW_HOURS, DEFAULT_CONTINUOUS_FLOW_HOURS)),
+            )
         )
-        await coordinator.async_config_entry_first_refresh()
+        entry.async_on_unload(coordinator.callbacks.async_clear)
+        if cached:
+            coordinator.restore()
+        else:
+            await coordinator.async_config_entry_first_refresh()
+        _async_check_meter_owners(hass, entry, coordinator)
+        if cached:
+            entry.async_create_background_task(
+                hass,
+                _async_connect_cached(hass, entry, tokens, coordinator),
+                f"{DOMAIN}_connect_{entry.entry_id}",
+            )
 
+        _async_register_account_device(hass, entry)
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-        entry.async_on_unload(entry.add_update_listener(async_reload_entry))
-
-        # load service to request data for a specific time frame
-        async def get_readings(call: ServiceCall) -> ServiceResponse:
-            """Handle a request to get readings."""
-            await _aw.get_usages()
-            return {
-                k: v.to_dict() for k, v in _aw.meters.items()
-            }
-
-        hass.services.async_register(
-            domain=DOMAIN,
-            service="get_readings",
-            service_func=get_readings,
-            supports_response=SupportsResponse.ONLY
-        )
-        ir.async_delete_issue(hass, DOMAIN, "maintenance")
+        settings = _entry_settings(entry)
+
+        async def _async_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+            """Reload the entry unless only the refresh token changed."""
+            if _entry_settings(entry) != settings:
+                await async_reload_entry(hass, entry)
+
+        entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
+
+        async_setup_services(hass)
         ir.async_delete_issue(hass, DOMAIN, "smart_meter_unavailable")
         return True
-    except ServiceUnavailableError as exception:
-        ir.async_create_issue(
-            hass,
-            DOMAIN,
-            "maintenance",
-            is_fixable=False,
-            is_persistent=False,
-            severity=ir.IssueSeverity.WARNING,
-            translation_key="maintenance",
-        )
+    except (CircuitOpenError, ServiceUnavailableError) as exception:
         raise ConfigEntryNotReady(
             exception, translation_domain=DOMAIN, translation_key="maintenance"
         ) from exception
@@ -126,13 +309,27 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            async_unload_services(hass)
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the cache and token of a removed entry."""
+    if tokens := hass.data.get(DATA_TOKENS, {}).pop(entry.entry_id, None):
+        tokens.async_stop()
+    await AnglianWaterCache(hass, entry.entry_id).async_remove()
+    if not any(
+        other.data[CONF_USERNAME].casefold() == entry.data[CONF_USERNAME].casefold()
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        await async_close_session(hass, entry.data[CONF_USERNAME])
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
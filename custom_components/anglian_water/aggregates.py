@@ -0,0 +1,108 @@
+"""Rolling consumption totals for Anglian Water meters."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .readings import MeterReadings
+
+PERIOD_TODAY = "today"
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIOD_BILLING = "billing_period"
+PERIOD_BILLING_LAST_YEAR = "billing_period_last_year"
+
+# Charges run from April to March, matching the published tariffs.
+BILLING_YEAR_START_MONTH = 4
+
+
+def _local_date(timestamp: float) -> date:
+    """Return the local date of a timestamp."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).date()
+
+
+def _year_earlier(day: date) -> date:
+    """Return the same day a year earlier, using 28 February for a leap day."""
+    try:
+        return day.replace(year=day.year - 1)
+    except ValueError:
+        return day.replace(year=day.year - 1, day=28)
+
+
+def billing_period_start(day: date) -> date:
+    """Return the first day of the billing year containing day."""
+    year = day.year if day.month >= BILLING_YEAR_START_MONTH else day.year - 1
+    return date(year, BILLING_YEAR_START_MONTH, 1)
+
+
+def period_bounds(today: date) -> dict[str, tuple[date, date]]:
+    """Return the first and last day of each period ending today."""
+    billing_start = billing_period_start(today)
+    return {
+        PERIOD_TODAY: (today, today),
+        PERIOD_WEEK: (today - timedelta(days=today.weekday()), today),
+        PERIOD_MONTH: (today.replace(day=1), today),
+        PERIOD_BILLING: (billing_start, today),
+        PERIOD_BILLING_LAST_YEAR: (
+            _year_earlier(billing_start), _year_earlier(today)
+        ),
+    }
+
+
+class MeterAggregates:
+    """Daily consumption totals of a meter and the periods built from them.
+
+    Days are summed once from the readings and only the days touched by a
+    refresh are summed again. Period totals are built from the daily
+    totals and kept until the next refresh or the next local day.
+    """
+
+    def __init__(self, readings: MeterReadings) -> None:
+        """Initialize."""
+        self.readings = readings
+        self.days: dict[int, float] = {}
+        self._totals: dict[str, float] = {}
+        self._totals_date: date | None = None
+
+    def update(self, start: float | None = None) -> None:
+        """Sum the days from the one containing start, or every day."""
+        if start is None or not self.days:
+            self.days.clear()
+            rows = self.readings.rows()
+        else:
+            first = _local_date(start)
+            for ordinal in [day for day in self.days if day >= first.toordinal()]:
+                del self.days[ordinal]
+            rows = self.readings.rows(dt_util.start_of_local_day(first).timestamp())
+        boundary = None
+        ordinal = 0
+        for timestamp, consumption, _ in rows:
+            if boundary is None or timestamp >= boundary:
+                day = _local_date(timestamp)
+                ordinal = day.toordinal()
+                boundary = dt_util.start_of_local_day(
+                    day + timedelta(days=1)
+                ).timestamp()
+                self.days.setdefault(ordinal, 0.0)
+            self.days[ordinal] += consumption
+        self._totals_date = None
+
+    def total(self, first: date, last: date) -> float:
+        """Return the consumption from the first to the last day inclusive."""
+        return sum(
+            self.days.get(ordinal, 0.0)
+            for ordinal in range(first.toordinal(), last.toordinal() + 1)
+        )
+
+    def totals(self, today: date | None = None) -> dict[str, float]:
+        """Return the consumption of each period up to and including today."""
+        today = today or dt_util.now().date()
+        if self._totals_date != today:
+            self._totals = {
+                period: self.total(first, last)
+                for period, (first, last) in period_bounds(today).items()
+            }
+            self._totals_date = today
+        return self._totals
@@ -0,0 +1,105 @@
+"""Binary sensor platform for anglian_water."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from pyanglianwater import SmartMeter
+
+from .const import DOMAIN
+from .coordinator import AnglianWaterDataUpdateCoordinator
+from .entity import AnglianWaterEntity, async_migrate_unique_ids
+from .leaks import LeakDetector, LeakType
+
+
+@dataclass(frozen=True, kw_only=True)
+class AnglianWaterBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes AnglianWater leak binary sensor entity."""
+
+    key: str
+    leak_type: LeakType
+    name_fn: Callable[[SmartMeter], str]
+    attributes_fn: Callable[[LeakDetector], dict[str, Any]]
+
+
+ENTITY_DESCRIPTIONS: dict[str, AnglianWaterBinarySensorEntityDescription] = {
+    "anglian_water_continuous_flow": AnglianWaterBinarySensorEntityDescription(
+        key="anglian_water_continuous_flow",
+        name_fn=lambda entity: f"{entity.serial_number} Continuous Flow",
+        icon="mdi:water-alert",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        leak_type=LeakType.CONTINUOUS_FLOW,
+        attributes_fn=lambda leaks: {
+            "flow_hours": leaks.flow_hours,
+            "threshold_hours": leaks.continuous_hours,
+        },
+    ),
+    "anglian_water_night_flow": AnglianWaterBinarySensorEntityDescription(
+        key="anglian_water_night_flow",
+        name_fn=lambda entity: f"{entity.serial_number} Night Flow",
+        icon="mdi:weather-night",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        leak_type=LeakType.NIGHT_FLOW,
+        attributes_fn=lambda leaks: {"minimum_night_flow": leaks.night_flow},
+    ),
+    "anglian_water_consumption_spike": AnglianWaterBinarySensorEntityDescription(
+        key="anglian_water_consumption_spike",
+        name_fn=lambda entity: f"{entity.serial_number} Consumption Spike",
+        icon="mdi:chart-bell-curve",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        leak_type=LeakType.SPIKE,
+        attributes_fn=lambda leaks: {
+            "baseline": leaks.baseline,
+            "spike_consumption": leaks.spike_consumption,
+            "spike_at": leaks.as_dict()["spike_at"],
+        },
+    ),
+}
+
+
+async def async_setup_entry(hass, entry, async_add_devices):
+    """Set up the binary sensor platform."""
+    coordinator: AnglianWaterDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    await async_migrate_unique_ids(hass, coordinator, ENTITY_DESCRIPTIONS)
+    for meter in coordinator.client.meters.values():
+        async_add_devices(
+            LeakSensor(
+                coordinator=coordinator,
+                entity_description=entity_description,
+                meter=meter
+            )
+            for entity_description in ENTITY_DESCRIPTIONS.values()
+        )
+
+
+class LeakSensor(AnglianWaterEntity, BinarySensorEntity):
+    """anglian_water leak binary sensor class."""
+
+    def __init__(
+        self,
+        coordinator: AnglianWaterDataUpdateCoordinator,
+        entity_description: AnglianWaterBinarySensorEntityDescription,
+        meter: SmartMeter
+    ) -> None:
+        """Initialize the binary sensor class."""
+        super().__init__(coordinator, entity_description.key, meter)
+        self.entity_description: AnglianWaterBinarySensorEntityDescription = (
+            entity_description
+        )
+        self._attr_name = entity_description.name_fn(meter)
+
+    def _compute_state(self) -> tuple[bool, dict[str, Any]]:
+        """Compute whether the leak pattern is present and what it is based on."""
+        leaks = self.coordinator.meter_leaks(self.meter)
+        self._attr_is_on = self.entity_description.leak_type in leaks.active
+        self._attr_extra_state_attributes = self.entity_description.attributes_fn(
+            leaks
+        )
+        return self._attr_is_on, self._attr_extra_state_attributes
@@ -0,0 +1,55 @@
+"""Persistent cache of Anglian Water account data and meter readings."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from pyanglianwater import AnglianWater, SmartMeter
+from pyanglianwater.api import API
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+# Seconds to wait before writing, so bursts of refreshes share one write.
+SAVE_DELAY = 60
+
+
+class AnglianWaterCache:
+    """Store the last known state of an account between restarts."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self.data: dict[str, Any] | None = None
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load the cached state."""
+        self.data = await self._store.async_load()
+        return self.data
+
+    def restore_client(self, api: API, custom_rate: float | None) -> AnglianWater:
+        """Build a client from the cached account metadata."""
+        client = AnglianWater(api)
+        client.meters = {}
+        client.account_config = self.data["account_config"]
+        client.tariff_config = self.data["tariff_config"]
+        client.current_tariff_area = self.data["current_tariff_area"]
+        client._custom_rate = custom_rate
+        for serial_number in self.data["meters"]:
+            client.meters[serial_number] = SmartMeter(
+                serial_number=serial_number,
+                tariff_config=client.get_tariff_config,
+            )
+        return client
+
+    def async_schedule_save(self, data_func) -> None:
+        """Write the cache once the save delay has passed."""
+        self._store.async_delay_save(data_func, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the cache."""
+        await self._store.async_remove()
@@ -0,0 +1,31 @@
+"""Lifecycle managed callbacks on the pyanglianwater client."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+
+if TYPE_CHECKING:
+    from pyanglianwater import AnglianWater
+
+
+class ClientCallbacks:
+    """Callbacks the client runs after it parses usage data.
+
+    The library keeps updated_data_callbacks on the AnglianWater class, so
+    every client shares one list that outlives config entry reloads. This
+    gives the client its own list and empties it when the entry unloads.
+    The coordinator is the single update path, so nothing is registered on
+    the list by the integration itself.
+    """
+
+    def __init__(self, client: AnglianWater) -> None:
+        """Initialize."""
+        client.updated_data_callbacks = []
+        self._callbacks = client.updated_data_callbacks
+
+    @callback
+    def async_clear(self) -> None:
+        """Remove every callback."""
+        self._callbacks.clear()
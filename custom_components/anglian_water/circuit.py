@@ -0,0 +1,166 @@
+"""Circuit breaker for Anglian Water outages."""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from datetime import timedelta
+from enum import StrEnum
+
+from aiohttp import ClientError
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+from pyanglianwater.exceptions import ServiceUnavailableError, UnknownEndpointError
+
+from .const import DOMAIN, LOGGER
+
+# Consecutive transient failures before the circuit opens. A maintenance
+# response from the API opens it straight away.
+FAILURE_THRESHOLD = 3
+# Bounds of the exponential backoff while the circuit is open.
+BACKOFF_MIN = timedelta(minutes=5)
+BACKOFF_MAX = timedelta(hours=2)
+# Shortest delay handed out while another account probes the service.
+RETRY_FLOOR = timedelta(minutes=1)
+
+ISSUE_MAINTENANCE = "maintenance"
+
+
+class CircuitState(StrEnum):
+    """States of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Stop calling Anglian Water while the service is down.
+
+    Failures open the circuit for an exponentially growing, jittered
+    delay. Once that passes the circuit is half open and a single request
+    probes the service: success closes the circuit, failure opens it again
+    for longer. The maintenance repair issue follows the open state.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.failures = 0
+        self.trips = 0
+        self._opened = False
+        self._retry_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current state."""
+        if not self._opened:
+            return CircuitState.CLOSED
+        if time.monotonic() < self._retry_at:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    @property
+    def retry_in(self) -> timedelta:
+        """Return how long until requests should be attempted again."""
+        if not self._opened:
+            return timedelta(0)
+        return max(
+            RETRY_FLOOR, timedelta(seconds=self._retry_at - time.monotonic())
+        )
+
+    def _backoff(self) -> float:
+        """Return the next open delay in seconds, with jitter."""
+        delay = min(
+            BACKOFF_MIN.total_seconds() * 2**self.trips,
+            BACKOFF_MAX.total_seconds(),
+        )
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @callback
+    def _async_open(self) -> None:
+        """Open the circuit and raise the maintenance issue."""
+        delay = self._backoff()
+        if not self._opened:
+            LOGGER.warning(
+                "Anglian Water is unavailable, pausing requests for %s",
+                timedelta(seconds=round(delay)),
+            )
+        else:
+            LOGGER.debug(
+                "Anglian Water still unavailable, pausing requests for %s",
+                timedelta(seconds=round(delay)),
+            )
+        self._opened = True
+        self._retry_at = time.monotonic() + delay
+        self.trips += 1
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            ISSUE_MAINTENANCE,
+            is_fixable=False,
+            is_persistent=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key=ISSUE_MAINTENANCE,
+        )
+
+    @callback
+    def async_record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self._probing = False
+        self.failures = 0
+        if not self._opened:
+            return
+        LOGGER.info("Anglian Water is available again")
+        self._opened = False
+        self.trips = 0
+        ir.async_delete_issue(self.hass, DOMAIN, ISSUE_MAINTENANCE)
+
+    @callback
+    def async_record_failure(self, outage: bool = False) -> None:
+        """Count a failed request, opening the circuit when needed."""
+        self._probing = False
+        self.failures += 1
+        if outage or self._opened or self.failures >= FAILURE_THRESHOLD:
+            self._async_open()
+
+    @contextmanager
+    def call(self) -> Generator[None]:
+        """Guard a request, raising CircuitOpenError if it may not run."""
+        state = self.state
+        if state is CircuitState.OPEN or (
+            state is CircuitState.HALF_OPEN and self._probing
+        ):
+            raise CircuitOpenError(f"Anglian Water is unavailable, retry in {self.retry_in}")
+        self._probing = state is CircuitState.HALF_OPEN
+        try:
+            yield
+        except ServiceUnavailableError:
+            self.async_record_failure(outage=True)
+            raise
+        except (UnknownEndpointError, ClientError, TimeoutError):
+            self.async_record_failure()
+            raise
+        except BaseException:
+            # Errors such as rejected credentials say nothing about the
+            # service, so they neither open nor close the circuit.
+            self._probing = False
+            raise
+        else:
+            self.async_record_success()
+
+    def as_dict(self) -> dict:
+        """Return the circuit state."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_in": self.retry_in.total_seconds(),
+        }
@@ -3,11 +3,10 @@
 from __future__ import annotations
 
 import voluptuous as vol
-from aiohttp import CookieJar
 from homeassistant import config_entries
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_ACCESS_TOKEN
+from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from pyanglianwater.auth import MSOB2CAuth
 from pyanglianwater.exceptions import (
     ServiceUnavailableError,
@@ -23,8 +22,16 @@ from .const import (
     CONF_VERSION,
     CONF_AREA,
     ANGLIAN_WATER_AREAS,
-    CONF_ACCOUNT_ID
+    CONF_ACCOUNT_ID,
+    CONF_CONTINUOUS_FLOW_HOURS,
+    CONF_DIAGNOSTICS_LIVE_SAMPLE,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    DEFAULT_CONTINUOUS_FLOW_HOURS,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
 )
+from .session import async_login_session
 
 
 class AnglianWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -33,6 +40,14 @@ class AnglianWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = CONF_VERSION
     _user_input: dict = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> AnglianWaterOptionsFlow:
+        """Get the options flow for this handler."""
+        return AnglianWaterOptionsFlow()
+
     async def async_step_reauth(self, entry_data):
         """Handle configuration by re-auth."""
         return await self.async_step_reauth_confirm()
@@ -42,16 +57,14 @@ class AnglianWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         _errors = {}
         reauth_entry = self._get_reauth_entry()
         if user_input is not None:
-            auth = MSOB2CAuth(
-                username=user_input[CONF_USERNAME],
-                password=user_input[CONF_PASSWORD],
-                session=async_create_clientsession(
-                    self.hass,
-                    cookie_jar=CookieJar(quote_cookie=False)
-                ),
-            )
             try:
-                await auth.send_login_request()
+                async with async_login_session(self.hass) as session:
+                    auth = MSOB2CAuth(
+                        username=user_input[CONF_USERNAME],
+                        password=user_input[CONF_PASSWORD],
+                        session=session,
+                    )
+                    await auth.send_login_request()
             except SelfAssertedError:
                 _errors["base"] = "auth"
             except ServiceUnavailableError:
@@ -98,15 +111,13 @@ class AnglianWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         _errors = {}
         if user_input is not None:
             try:
-                auth = MSOB2CAuth(
-                    username=user_input[CONF_USERNAME],
-                    password=user_input[CONF_PASSWORD],
-                    session=async_create_clientsession(
-                        self.hass,
-                        cookie_jar=CookieJar(quote_cookie=False)
-                    ),
-                )
-                await auth.send_login_request()
+                async with async_login_session(self.hass) as session:
+                    auth = MSOB2CAuth(
+                        username=user_input[CONF_USERNAME],
+                        password=user_input[CONF_PASSWORD],
+                        session=session,
+                    )
+                    await auth.send_login_request()
                 user_input[CONF_ACCESS_TOKEN] = auth.refresh_token
             except SelfAssertedError as exception:
                 LOGGER.warning(exception)
@@ -230,3 +241,72 @@ class AnglianWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             title=self._user_input[CONF_USERNAME],
             data=self._user_input,
         )
+
+
+class AnglianWaterOptionsFlow(config_entries.OptionsFlow):
+    """Options flow for Anglian Water."""
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the polling options."""
+        _errors = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                _errors["base"] = "interval"
+            else:
+                return self.async_create_entry(
+                    data={**self.config_entry.options, **user_input}
+                )
+        options = user_input or self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MIN_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=5,
+                            max=1440,
+                            unit_of_measurement="min",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_MAX_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=5,
+                            max=1440,
+                            unit_of_measurement="min",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_CONTINUOUS_FLOW_HOURS,
+                        default=options.get(
+                            CONF_CONTINUOUS_FLOW_HOURS,
+                            DEFAULT_CONTINUOUS_FLOW_HOURS),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=2,
+                            max=168,
+                            unit_of_measurement="h",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_DIAGNOSTICS_LIVE_SAMPLE,
+                        default=options.get(
+                            CONF_DIAGNOSTICS_LIVE_SAMPLE, False),
+                    ): selector.BooleanSelector(),
+                }
+            ),
+            errors=_errors,
+        )
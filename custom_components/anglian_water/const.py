@@ -2,19 +2,29 @@
 
 from logging import Logger, getLogger
 
-from pyanglianwater import _version
-
 LOGGER: Logger = getLogger(__package__)
 
 NAME = "Anglian Water"
 DOMAIN = "anglian_water"
-VERSION = _version.__version__
 
 CONF_ACCOUNT_ID = "account_id"
 CONF_TARIFF = "tariff"
 CONF_CUSTOM_RATE = "custom_rate"
 CONF_VERSION = 4
 CONF_AREA = "area"
+CONF_MIN_INTERVAL = "min_update_interval"
+CONF_MAX_INTERVAL = "max_update_interval"
+CONF_DIAGNOSTICS_LIVE_SAMPLE = "diagnostics_live_sample"
+CONF_CONTINUOUS_FLOW_HOURS = "continuous_flow_hours"
+
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+DATA_SESSIONS = f"{DOMAIN}_sessions"
+DATA_TOKENS = f"{DOMAIN}_tokens"
+SIGNAL_REFRESH_METRICS = f"{DOMAIN}_refresh_metrics_{{}}"
+
+DEFAULT_MIN_INTERVAL = 15
+DEFAULT_MAX_INTERVAL = 240
+DEFAULT_CONTINUOUS_FLOW_HOURS = 24
 
 ANGLIAN_WATER_AREAS = [
     "Anglian",
@@ -1,16 +1,23 @@
 """DataUpdateCoordinator for integration_blueprint."""
 
 from __future__ import annotations
-from datetime import timedelta
+import time
+from collections import Counter, deque
+from collections.abc import Generator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.exceptions import ConfigEntryAuthFailed
-from pyanglianwater import AnglianWater
+from homeassistant.util import dt as dt_util
+from pyanglianwater import AnglianWater, SmartMeter
+from pyanglianwater.enum import UsagesReadGranularity
 from pyanglianwater.exceptions import (
     UnknownEndpointError,
     ExpiredAccessTokenError,
@@ -19,7 +26,45 @@ from pyanglianwater.exceptions import (
     SmartMeterUnavailableError
 )
 
-from .const import DOMAIN, LOGGER
+from .aggregates import MeterAggregates
+from .cache import AnglianWaterCache
+from .callbacks import ClientCallbacks
+from .circuit import CircuitOpenError
+from .forecast import ConsumptionForecast
+from .leaks import EVENT_LEAK_DETECTED, LeakDetector
+from .const import DOMAIN, LOGGER, SIGNAL_REFRESH_METRICS
+from .polling import AdaptivePollingSchedule
+from .readings import HOUR, MeterReadings, format_read_at
+from .scheduler import AnglianWaterScheduler
+from .statistics import MeterStatistics
+from .tariff import MeterCosts, Tariff
+from .token_manager import AnglianWaterTokenManager
+
+
+# Number of refreshes kept for diagnostics.
+REFRESH_HISTORY = 20
+# Missing hours older than this are no longer waited for.
+GAP_LOOKBACK = timedelta(days=7)
+# Poll interval after a recent hour first goes missing, doubled on each
+# retry until GAP_RETRY_LIMIT retries were spent on it.
+GAP_RETRY_INTERVAL = timedelta(hours=1)
+GAP_RETRY_LIMIT = 4
+# Missing hours older than this no longer shorten the poll interval.
+GAP_RETRY_WINDOW = timedelta(days=2)
+
+
+def _fingerprint(readings: list[dict]) -> tuple:
+    """Return a cheap fingerprint of a meter's readings payload."""
+    if not readings:
+        return (0, None, 0)
+    return (
+        len(readings),
+        readings[-1]["read_at"],
+        hash(tuple(
+            (reading["read_at"], reading["consumption"], reading["read"])
+            for reading in readings
+        )),
+    )
 
 
 class AnglianWaterDataUpdateCoordinator(DataUpdateCoordinator):
@@ -31,23 +76,432 @@ class AnglianWaterDataUpdateCoordinator(DataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         client: AnglianWater,
+        cache: AnglianWaterCache,
+        tokens: AnglianWaterTokenManager,
+        scheduler: AnglianWaterScheduler,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        continuous_flow_hours: int,
     ) -> None:
         """Initialize."""
         self.client = client
+        self.callbacks = ClientCallbacks(client)
+        self.cache = cache
+        self.tokens = tokens
+        self.scheduler = scheduler
+        self.polling = AdaptivePollingSchedule(min_interval, max_interval)
+        self.readings: dict[str, MeterReadings] = {}
+        self.statistics: dict[str, MeterStatistics] = {}
+        self.tariff = Tariff.from_client(client)
+        self.costs: dict[str, MeterCosts] = {}
+        self.aggregates: dict[str, MeterAggregates] = {}
+        self.leaks: dict[str, LeakDetector] = {}
+        self.forecasts: dict[str, ConsumptionForecast] = {}
+        self.continuous_flow_hours = continuous_flow_hours
+        self.unchanged_refreshes = 0
+        self.last_refresh: datetime | None = None
+        self.refresh_history: deque[dict] = deque(maxlen=REFRESH_HISTORY)
+        self.error_counts: Counter[str] = Counter()
+        self.skipped_counts: Counter[str] = Counter()
+        self.gaps: dict[str, list[tuple[int, int]]] = {}
+        self.gap_retries: dict[tuple[str, int], int] = {}
+        self._fingerprints: dict[str, tuple] = {}
+        self._staggered = False
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=30),
+            update_interval=min_interval,
+            always_update=False,
+        )
+
+    def meter_readings(self, meter: SmartMeter) -> MeterReadings:
+        """Return the parsed readings of a meter."""
+        if meter.serial_number not in self.readings:
+            self.readings[meter.serial_number] = MeterReadings()
+        return self.readings[meter.serial_number]
+
+    def meter_costs(self, meter: SmartMeter) -> MeterCosts:
+        """Return the cost series of a meter."""
+        if meter.serial_number not in self.costs:
+            self.costs[meter.serial_number] = MeterCosts(
+                self.meter_readings(meter), self.tariff
+            )
+        return self.costs[meter.serial_number]
+
+    def meter_statistics(self, meter: SmartMeter) -> MeterStatistics:
+        """Return the statistics pipeline for a meter."""
+        if meter.serial_number not in self.statistics:
+            self.statistics[meter.serial_number] = MeterStatistics(
+                self.hass,
+                meter,
+                self.meter_readings(meter),
+                self.meter_costs(meter),
+            )
+        return self.statistics[meter.serial_number]
+
+    def update_tariff(self) -> None:
+        """Rebuild the tariff after the client's tariff config changed."""
+        self.tariff = Tariff.from_client(self.client)
+        for costs in self.costs.values():
+            costs.set_tariff(self.tariff)
+
+    def meter_aggregates(self, meter: SmartMeter) -> MeterAggregates:
+        """Return the rolling consumption totals of a meter."""
+        if meter.serial_number not in self.aggregates:
+            self.aggregates[meter.serial_number] = MeterAggregates(
+                self.meter_readings(meter)
+            )
+        return self.aggregates[meter.serial_number]
+
+    def meter_leaks(self, meter: SmartMeter) -> LeakDetector:
+        """Return the leak detector of a meter."""
+        if meter.serial_number not in self.leaks:
+            self.leaks[meter.serial_number] = LeakDetector(
+                self.meter_readings(meter), self.continuous_flow_hours
+            )
+        return self.leaks[meter.serial_number]
+
+    def meter_forecast(self, meter: SmartMeter) -> ConsumptionForecast:
+        """Return the consumption forecast of a meter."""
+        if meter.serial_number not in self.forecasts:
+            self.forecasts[meter.serial_number] = ConsumptionForecast(
+                self.meter_readings(meter)
+            )
+        return self.forecasts[meter.serial_number]
+
+    def meter_projections(self, meter: SmartMeter) -> dict[str, dict]:
+        """Return the projected consumption and cost of a meter's periods."""
+        return self.meter_forecast(meter).projections(
+            self.meter_costs(meter),
+            self.tariff,
+            self.meter_aggregates(meter).totals(),
+        )
+
+    def restore(self) -> None:
+        """Load readings and polling state from the cache."""
+        for serial_number, readings in self.cache.data["meters"].items():
+            self.readings[serial_number] = MeterReadings.from_dict(readings)
+            self.gaps[serial_number] = self.readings[serial_number].gaps(
+                self._gap_start()
+            )
+            self.aggregates[serial_number] = MeterAggregates(
+                self.readings[serial_number]
+            )
+            self.aggregates[serial_number].update()
+            self.leaks[serial_number] = LeakDetector(
+                self.readings[serial_number], self.continuous_flow_hours
+            )
+            self.leaks[serial_number].update()
+            self.forecasts[serial_number] = ConsumptionForecast.from_dict(
+                self.readings[serial_number],
+                self.cache.data.get("forecasts", {}).get(serial_number, {}),
+            )
+            self.forecasts[serial_number].update()
+        self.polling.arrivals = self.cache.data.get(
+            "polling_arrivals", self.polling.arrivals
         )
+        self.async_set_updated_data(self._snapshot())
+
+    def _cache_data(self) -> dict:
+        """Return the state written to the cache."""
+        return {
+            "account_config": self.client.account_config,
+            "tariff_config": self.client.tariff_config,
+            "current_tariff_area": self.client.current_tariff_area,
+            "meters": {
+                serial_number: readings.as_dict()
+                for serial_number, readings in self.readings.items()
+            },
+            "polling_arrivals": self.polling.arrivals,
+            "forecasts": {
+                serial_number: forecast.as_dict()
+                for serial_number, forecast in self.forecasts.items()
+            },
+        }
+
+    def _snapshot(self) -> dict:
+        """Return the data handed to listeners."""
+        # Listeners are only notified when this differs from the last
+        # refresh. The date is included so day based sensors roll over.
+        return {
+            "date": dt_util.now().date(),
+            "meters": dict(self._fingerprints),
+        }
+
+    @property
+    def latest_timestamp(self) -> int | None:
+        """Return the timestamp of the newest reading across all meters."""
+        return max(
+            (
+                readings.last_timestamp for readings in self.readings.values()
+                if readings.last_timestamp is not None
+            ),
+            default=None,
+        )
+
+    def sync_readings(self) -> dict[SmartMeter, int]:
+        """Merge changed meter payloads into the store.
+
+        Return the meters whose readings changed with the timestamp of the
+        earliest changed reading. The library's copy of the readings is
+        dropped once merged, the store is the only one kept.
+        """
+        changed = {}
+        for meter in self.client.meters.values():
+            readings, meter.readings = meter.readings, []
+            fingerprint = _fingerprint(readings)
+            if self._fingerprints.get(meter.serial_number) == fingerprint:
+                continue
+            self._fingerprints[meter.serial_number] = fingerprint
+            if (changed_from := self.meter_readings(meter).extend(readings)) is None:
+                continue
+            changed[meter] = changed_from
+        return changed
+
+    @staticmethod
+    def _gap_start() -> float:
+        """Return the oldest timestamp checked for missing hours."""
+        return (dt_util.utcnow() - GAP_LOOKBACK).timestamp()
+
+    def _filled_gaps(self, meter: SmartMeter) -> list[tuple[int, int]]:
+        """Update a meter's missing hours, return the runs now filled in."""
+        readings = self.meter_readings(meter)
+        previous = self.gaps.get(meter.serial_number, [])
+        self.gaps[meter.serial_number] = readings.gaps(self._gap_start())
+        filled = []
+        for first, last in previous:
+            lo, hi = readings.bounds(first, last + HOUR)
+            if hi > lo:
+                filled.append((first, last))
+        return filled
+
+    @property
+    def missing_hours(self) -> int:
+        """Return the number of recent hours missing across all meters."""
+        return sum(
+            (last - first) // HOUR + 1
+            for gaps in self.gaps.values()
+            for first, last in gaps
+        )
+
+    def _gap_retry_interval(self) -> timedelta | None:
+        """Return the poll interval to retry recent missing hours, if any.
+
+        Each run of missing hours is retried a limited number of times with
+        a growing interval, so an hour upstream never supplies does not hold
+        polling down.
+        """
+        recent = (dt_util.utcnow() - GAP_RETRY_WINDOW).timestamp()
+        pending = {
+            (serial_number, first)
+            for serial_number, gaps in self.gaps.items()
+            for first, last in gaps
+            if last >= recent
+        }
+        self.gap_retries = {
+            gap: retries for gap, retries in self.gap_retries.items()
+            if gap in pending
+        }
+        pending = {
+            gap for gap in pending
+            if self.gap_retries.get(gap, 0) < GAP_RETRY_LIMIT
+        }
+        if not pending:
+            return None
+        interval = min(
+            GAP_RETRY_INTERVAL * 2 ** self.gap_retries.get(gap, 0) for gap in pending
+        )
+        for gap in pending:
+            self.gap_retries[gap] = self.gap_retries.get(gap, 0) + 1
+        return max(self.polling.min_interval, interval)
+
+    async def async_ensure_readings(self, end: float | None = None) -> None:
+        """Refresh from upstream if readings before end may be missing.
+
+        Without an end the local readings are used as they are, so open
+        ended service calls do not spend API requests.
+        """
+        latest_timestamp = self.latest_timestamp
+        if end is None or (
+            latest_timestamp is not None and end <= latest_timestamp + HOUR
+        ):
+            return
+        if (
+            self.last_refresh is not None
+            and dt_util.utcnow() - self.last_refresh < self.polling.min_interval
+        ):
+            return
+        await self.async_refresh()
+
+    @property
+    def last_refresh_record(self) -> dict:
+        """Return the metrics of the most recent refresh."""
+        return self.refresh_history[-1] if self.refresh_history else {}
+
+    @contextmanager
+    def _track_refresh(self) -> Generator[dict]:
+        """Record the outcome and duration of a refresh.
+
+        Polls skipped by the circuit breaker or for want of a smart meter
+        are counted apart from errors.
+        """
+        record = {
+            "started": dt_util.utcnow().isoformat(),
+            "error": None,
+            "skipped": None,
+            "phases": {},
+        }
+        started = time.perf_counter()
+        try:
+            yield record
+        except (CircuitOpenError, SmartMeterUnavailableError) as exception:
+            # The poll did not reach the API or found nothing to read.
+            record["skipped"] = type(exception).__name__
+            self.skipped_counts[record["skipped"]] += 1
+            raise
+        except Exception as exception:
+            record["error"] = type(exception).__name__
+            self.error_counts[record["error"]] += 1
+            raise
+        finally:
+            record["duration"] = round(time.perf_counter() - started, 3)
+            self.refresh_history.append(record)
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_REFRESH_METRICS.format(self.config_entry.entry_id),
+            )
+
+    @staticmethod
+    @contextmanager
+    def _timed(record: dict, phase: str) -> Generator[None]:
+        """Record how long a phase of a refresh took."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record["phases"][phase] = round(time.perf_counter() - started, 3)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and time the entity writes."""
+        if not self.refresh_history:
+            super().async_update_listeners()
+            return
+        with self._timed(self.refresh_history[-1], "entities"):
+            super().async_update_listeners()
+
+    async def async_fetch_usages(
+        self, granularity: UsagesReadGranularity, record: dict | None = None
+    ) -> dict | list:
+        """Fetch raw usage data through the scheduler and circuit breaker.
+
+        The response is returned unparsed, so the client's meters are left
+        as they are.
+        """
+        record = record if record is not None else {"phases": {}}
+        async with self.scheduler.async_slot():
+            with self._timed(record, "token"):
+                await self.tokens.async_ensure_token()
+            with self._timed(record, "fetch"):
+                return await self.client.api.send_request(
+                    endpoint="get_usage_details",
+                    body=None,
+                    GRANULARITY=str(granularity),
+                )
+
+    async def _async_refresh_readings(self, record: dict) -> dict:
+        """Fetch readings and pass any changes through the pipeline."""
+        latest_timestamp = self.latest_timestamp
+        response = await self.async_fetch_usages(UsagesReadGranularity.HOURLY, record)
+        record["response_bytes"] = self.tokens.auth.last_response_bytes
+        with self._timed(record, "parse"):
+            await self.client.parse_usages(response)
+            record["meter_readings"] = {
+                serial: len(meter.readings)
+                for serial, meter in self.client.meters.items()
+            }
+            changed = self.sync_readings()
+        record["changed_meters"] = len(changed)
+        if not changed:
+            self.unchanged_refreshes += 1
+            LOGGER.debug(
+                "Readings unchanged, skipping update (%s unchanged refreshes)",
+                self.unchanged_refreshes,
+            )
+        with self._timed(record, "aggregates"):
+            for meter, changed_from in changed.items():
+                costs = self.meter_costs(meter)
+                costs.invalidate(changed_from)
+                costs.update()
+                self.meter_aggregates(meter).update(changed_from)
+        with self._timed(record, "leaks"):
+            for meter in changed:
+                leaks = self.meter_leaks(meter)
+                for leak_type in leaks.update():
+                    LOGGER.warning(
+                        "Possible leak on meter %s: %s", meter.serial_number, leak_type
+                    )
+                    self.hass.bus.async_fire(EVENT_LEAK_DETECTED, {
+                        "meter": meter.serial_number,
+                        "type": leak_type,
+                        **leaks.as_dict(),
+                    })
+        with self._timed(record, "forecast"):
+            for meter in changed:
+                self.meter_forecast(meter).update()
+        with self._timed(record, "statistics"):
+            for meter in changed:
+                statistics = self.meter_statistics(meter)
+                await statistics.async_update()
+                for first, last in self._filled_gaps(meter):
+                    LOGGER.debug(
+                        "Importing late readings for %s from %s to %s",
+                        meter.serial_number,
+                        format_read_at(first),
+                        format_read_at(last),
+                    )
+                    await statistics.async_import_range(first, last + HOUR)
+        record["missing_hours"] = self.missing_hours
+        if changed:
+            self.cache.async_schedule_save(self._cache_data)
+        interval = self.polling.next_interval(
+            self.latest_timestamp != latest_timestamp
+        )
+        if (retry_interval := self._gap_retry_interval()) is not None:
+            # Keep asking while upstream may still deliver the missing hours.
+            interval = min(interval, retry_interval)
+        self.update_interval = interval
+        if not self._staggered:
+            # Shift this account's polls once, out of step with the others.
+            self._staggered = True
+            self.update_interval += self.scheduler.stagger(
+                self.config_entry.entry_id, interval
+            )
+        LOGGER.debug("Next update in %s", self.update_interval)
+        self.last_refresh = dt_util.utcnow()
+        return self._snapshot()
+
+    def _retry_interval(self) -> timedelta:
+        """Return the delay before retrying a failed refresh."""
+        if self.scheduler.circuit.retry_in:
+            return self.scheduler.circuit.retry_in
+        return self.polling.min_interval
 
     async def _async_update_data(self, token_refreshed: bool = False):
         """Update data via library."""
         try:
-            await self.client.update()
+            with self._track_refresh() as record:
+                return await self._async_refresh_readings(record)
+        except CircuitOpenError as exception:
+            # Skip polling until the circuit lets a request through again.
+            self.update_interval = self.scheduler.circuit.retry_in
+            raise UpdateFailed(exception) from exception
         except UnknownEndpointError as exception:
+            self.update_interval = self._retry_interval()
             raise UpdateFailed(exception) from exception
         except ServiceUnavailableError as exception:
+            self.update_interval = self._retry_interval()
             raise UpdateFailed(exception) from exception
         except InvalidAccountIdError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
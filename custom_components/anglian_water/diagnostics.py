@@ -1,15 +1,23 @@
 """Home Assistant Anglian Water Diagnostics."""
 
+from __future__ import annotations
+
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_ACCESS_TOKEN
 from homeassistant.core import HomeAssistant
-from typing import Any
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
 from homeassistant.helpers.device_registry import DeviceEntry
 
-from pyanglianwater.enum import UsagesReadGranularity
+from .const import CONF_DIAGNOSTICS_LIVE_SAMPLE, DOMAIN
+from .readings import MeterReadings, format_read_at
+
+if TYPE_CHECKING:
+    from .coordinator import AnglianWaterDataUpdateCoordinator
 
-from .const import DOMAIN
+# Number of readings included per meter and in the live sample.
+SAMPLE_SIZE = 48
 
 REDACTED_FIELDS = [
     CONF_USERNAME,
@@ -32,24 +40,120 @@ REDACTED_FIELDS = [
 ]
 
 
+def _readings_summary(readings: MeterReadings) -> dict[str, Any]:
+    """Summarise a meter's cached readings."""
+    if not readings:
+        return {"count": 0}
+    return {
+        "count": len(readings),
+        "first_read_at": format_read_at(readings.first_timestamp),
+        "last_read_at": format_read_at(readings.last_timestamp),
+        "latest_read": readings.latest_read,
+        "recent": readings.tail(SAMPLE_SIZE),
+    }
+
+
+def _client_summary(coordinator: AnglianWaterDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the client state without the per meter reading lists."""
+    client = coordinator.client.to_dict()
+    client["meters"] = {
+        serial: {
+            "serial_number": serial,
+            "tariff_rate": coordinator.tariff.period_at().rate,
+            "latest_cost": coordinator.meter_costs(meter).latest_cumulative,
+            "readings": _readings_summary(coordinator.meter_readings(meter)),
+        }
+        for serial, meter in coordinator.client.meters.items()
+    }
+    return client
+
+
+async def _async_live_sample(
+    coordinator: AnglianWaterDataUpdateCoordinator,
+) -> list[dict] | dict[str, str]:
+    """Fetch a sample of raw usage data without touching the cached meters.
+
+    The usage endpoint takes no date range, daily readings are the
+    smallest response it gives.
+    """
+    from pyanglianwater.enum import UsagesReadGranularity
+    from pyanglianwater.exceptions import (
+        ServiceUnavailableError,
+        SmartMeterUnavailableError,
+        UnknownEndpointError,
+    )
+
+    from .circuit import CircuitOpenError
+
+    try:
+        response = await coordinator.async_fetch_usages(UsagesReadGranularity.DAILY)
+    except (
+        CircuitOpenError,
+        ServiceUnavailableError,
+        SmartMeterUnavailableError,
+        UnknownEndpointError,
+    ) as exception:
+        return {"error": type(exception).__name__}
+    if "result" in response:
+        response = response["result"]
+    if "records" in response:
+        response = response["records"]
+    return async_redact_data(list(response)[-SAMPLE_SIZE:], REDACTED_FIELDS)
+
+
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
 ) -> dict[str, Any]:
     """Get diagnostics for a config entry."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
-    return {
+    entry: AnglianWaterDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    diagnostics = {
         "config_entry": async_redact_data(config_entry.data, REDACTED_FIELDS),
         "options": async_redact_data(config_entry.options, REDACTED_FIELDS),
-        "anglian_water": async_redact_data(entry.client.to_dict(), REDACTED_FIELDS),
-        "metering_data": async_redact_data(
-            await entry.client.get_usages(
-                interval=UsagesReadGranularity.HOURLY,
-                update_cache=False
-            ),
-            REDACTED_FIELDS
-        )
+        "anglian_water": async_redact_data(_client_summary(entry), REDACTED_FIELDS),
+        "coordinator": {
+            "last_refresh": entry.last_refresh,
+            "unchanged_refreshes": entry.unchanged_refreshes,
+            "errors": dict(entry.error_counts),
+            "skipped": dict(entry.skipped_counts),
+            "polling": entry.polling.as_dict(),
+            "circuit": entry.scheduler.circuit.as_dict(),
+            "tariff": [
+                {**asdict(period), "start": format_read_at(period.start)}
+                for period in entry.tariff.periods
+            ],
+            "gaps": {
+                serial_number: [
+                    {
+                        "first": format_read_at(first),
+                        "last": format_read_at(last),
+                        "retries": entry.gap_retries.get((serial_number, first), 0),
+                    }
+                    for first, last in gaps
+                ]
+                for serial_number, gaps in entry.gaps.items()
+            },
+            "leaks": {
+                serial_number: {
+                    "active": sorted(leaks.active),
+                    **leaks.as_dict(),
+                }
+                for serial_number, leaks in entry.leaks.items()
+            },
+            "forecasts": {
+                serial_number: {
+                    "processed": None if forecast.processed is None
+                    else format_read_at(forecast.processed),
+                    "profile": forecast.profile,
+                }
+                for serial_number, forecast in entry.forecasts.items()
+            },
+            "refreshes": list(entry.refresh_history),
+        },
     }
+    if config_entry.options.get(CONF_DIAGNOSTICS_LIVE_SAMPLE, False):
+        diagnostics["metering_data"] = await _async_live_sample(entry)
+    return diagnostics
 
 
 async def async_get_device_diagnostics(
@@ -58,10 +162,15 @@ async def async_get_device_diagnostics(
     device_entry: DeviceEntry,
 ) -> dict[str, Any]:
     """Get diagnostics for a device entry."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
+    entry: AnglianWaterDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     meter = entry.client.meters.get(device_entry.serial_number, None)
     if meter is not None:
-        meter = meter.to_dict()
+        meter = {
+            "serial_number": meter.serial_number,
+            "tariff_rate": entry.tariff.period_at().rate,
+            "latest_cost": entry.meter_costs(meter).latest_cumulative,
+            "readings": _readings_summary(entry.meter_readings(meter)),
+        }
     else:
         meter = {}
     return {
@@ -2,28 +2,80 @@
 
 from __future__ import annotations
 import logging
-from datetime import timedelta
 
-from homeassistant.const import MATCH_ALL
-from homeassistant.helpers.entity import DeviceInfo
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.const import MATCH_ALL, EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo, Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
-from homeassistant.components.recorder.statistics import (
-    async_import_statistics
-)
-from homeassistant.util import dt as dt_util
-from pyanglianwater import SmartMeter
-
-from .const import DOMAIN, NAME, VERSION
+from pyanglianwater import SmartMeter, _version
+
+from .const import DOMAIN, NAME, SIGNAL_REFRESH_METRICS
 from .coordinator import AnglianWaterDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class AnglianWaterEntity(CoordinatorEntity):
-    """AnglianWaterEntity class."""
+def meter_unique_id(entry_id: str, meter: SmartMeter, key: str) -> str:
+    """Return the unique ID of a meter entity.
+
+    Scoped to the config entry as well as the meter, so a meter reachable
+    from two entries does not collide.
+    """
+    return f"{entry_id}_{meter.serial_number}_{key}"
+
+
+async def async_migrate_unique_ids(
+    hass: HomeAssistant,
+    coordinator: AnglianWaterDataUpdateCoordinator,
+    keys: Iterable[str],
+) -> None:
+    """Move meter entities to entry and serial number based unique IDs.
+
+    Meter entities used to be keyed by the config entry only, so each key
+    was registered once, by the first meter of the account. Those entries
+    now belong to that meter. Entities keyed by the serial number only
+    gain the entry.
+    """
+    if not coordinator.client.meters:
+        return
+    entry_id = coordinator.config_entry.entry_id
+    meters = list(coordinator.client.meters.values())
+    migrations = {
+        f"{meter.serial_number}_{key}": meter_unique_id(entry_id, meter, key)
+        for meter in meters
+        for key in keys
+    }
+    migrations.update(
+        {f"{entry_id}_{key}": meter_unique_id(entry_id, meters[0], key) for key in keys}
+    )
+
+    @callback
+    def _async_migrate(entity_entry: er.RegistryEntry) -> dict | None:
+        if (unique_id := migrations.get(entity_entry.unique_id)) is None:
+            return None
+        _LOGGER.debug(
+            "Migrating %s unique ID to %s", entity_entry.entity_id, unique_id
+        )
+        return {"new_unique_id": unique_id}
+
+    await er.async_migrate_entries(hass, entry_id, _async_migrate)
+
+
+class AnglianWaterEntity(CoordinatorEntity, ABC):
+    """AnglianWaterEntity class.
+
+    The state is computed once per coordinator update by _compute_state and
+    only written when it differs from the last written state.
+    """
 
     _unrecorded_attributes = frozenset({MATCH_ALL})
+    _written_state: tuple[bool, Any] | None = None
 
     def __init__(
         self,
@@ -34,109 +86,65 @@ class AnglianWaterEntity(CoordinatorEntity):
         """Initialize."""
         super().__init__(coordinator)
         self.meter = meter
-        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{entity}"
+        self._attr_unique_id = meter_unique_id(
+            coordinator.config_entry.entry_id, meter, entity
+        )
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
+            identifiers={(DOMAIN, meter.serial_number)},
             name=meter.serial_number,
-            model=VERSION,
+            model=_version.__version__,
             manufacturer=NAME,
-            serial_number=meter.serial_number
+            serial_number=meter.serial_number,
+            via_device=(DOMAIN, coordinator.config_entry.entry_id),
         )
-        coordinator.client.register_callback(self.schedule_update_ha_state)
-        coordinator.client.register_callback(self._update_statistics)
-
-    async def _update_statistics(self):
-        """Update statistics for this meter."""
-        _LOGGER.debug("Updating statistics for %s", self.entity_id)
-        metadata = StatisticMetaData(
-            source="recorder",
-            statistic_id=self.entity_id,
-            name=self.name,
-            has_mean=False,
-            has_sum=True,
-            unit_of_measurement=self.unit_of_measurement
+
+    @abstractmethod
+    def _compute_state(self) -> Any:
+        """Set the state attributes from the coordinator, return the state."""
+
+    async def async_added_to_hass(self) -> None:
+        """Compute the state written when the entity is added."""
+        self._written_state = (self.available, self._compute_state())
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if it changed since the last write."""
+        state = (self.available, self._compute_state())
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self.async_write_ha_state()
+
+
+class AnglianWaterAccountEntity(Entity):
+    """Diagnostic entity describing the refreshes of an account."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def __init__(
+        self,
+        coordinator: AnglianWaterDataUpdateCoordinator,
+        entity: str,
+    ) -> None:
+        """Initialize."""
+        self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{entity}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
         )
-        new_statistic_data = []
-        for reading in self.meter.readings:
-            stat_start = dt_util.as_local(dt_util.parse_datetime(
-                reading["read_at"])) - timedelta(hours=1)
-            if self.entity_description.key == "anglian_water_latest_reading":
-                new_statistic_data.append(StatisticData(
-                    start=stat_start,
-                    state=reading["consumption"]/1000,
-                    sum=reading["read"]
-                ))
-            if self.entity_description.key == "anglian_water_latest_cost":
-                new_statistic_data.append(StatisticData(
-                    start=stat_start,
-                    state=reading["consumption"] *
-                    (self.meter.tariff_rate/1000),
-                    sum=reading["read"] * self.meter.tariff_rate
-                ))
-        async_import_statistics(
-            self.hass,
-            metadata=metadata,
-            statistics=new_statistic_data
+
+    async def async_added_to_hass(self) -> None:
+        """Write state after every refresh."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_REFRESH_METRICS.format(
+                    self.coordinator.config_entry.entry_id
+                ),
+                self.async_write_ha_state,
+            )
         )
-    # async def migrate_statistics(self):
-    #     """Migrate statistics from external to internal."""
-    #     timespan = datetime.now() - timedelta(days=365*10)
-    #     timespan = datetime.now() - datetime.combine(
-    #         timespan, datetime.min.time()
-    #     )
-    #     stat_count = (
-    #         int(
-    #             round(
-    #                 (((timespan.seconds / 3600) + (timespan.days * 24)) * 60) / 2, 0
-    #             )
-    #         )
-    #         + 1
-    #     )
-    #     try:
-    #         if self.entity_description.key == "anglian_water_latest_consumption":
-    #             stat_id = f"{DOMAIN}:anglian_water_previous_consumption"
-    #             stats = await get_instance(self.hass).async_add_executor_job(
-    #                 get_last_statistics, self.hass, stat_count, stat_id, True, {
-    #                     "sum", "state"}
-    #             )
-    #             metadata = StatisticMetaData(
-    #                 source="recorder",
-    #                 statistic_id=self.entity_id,
-    #                 name=self.name,
-    #                 has_mean=False,
-    #                 has_sum=True,
-    #                 unit_of_measurement=UnitOfVolume.LITERS
-    #             )
-    #         elif self.entity_description.key == "anglian_water_latest_cost":
-    #             stat_id = f"{DOMAIN}:anglian_water_previous_costs"
-    #             stats = await get_instance(self.hass).async_add_executor_job(
-    #                 get_last_statistics, self.hass, stat_count, stat_id, True, {
-    #                     "sum", "state"}
-    #             )
-    #             metadata = StatisticMetaData(
-    #                 source="recorder",
-    #                 statistic_id=self.entity_id,
-    #                 name=self.name,
-    #                 has_mean=False,
-    #                 has_sum=True,
-    #                 unit_of_measurement="GBP"
-    #             )
-    #         else:
-    #             return None
-    #         if len(stats) > 0:
-    #             for stat in stats[stat_id]:
-    #                 async_import_statistics(
-    #                     self.hass,
-    #                     metadata=metadata,
-    #                     statistics=[StatisticData(
-    #                         start=dt_util.as_local(datetime.fromtimestamp(
-    #                             stat["start"])),
-    #                         end=dt_util.as_local(datetime.fromtimestamp(
-    #                             stat["end"])),
-    #                         state=stat["state"],
-    #                         sum=stat["sum"]
-    #                     )]
-    #                 )
-    #     except Exception as exception:
-    #         _LOGGER.error("Stats migration failed: %s", exception)
-    #         return False
@@ -0,0 +1,209 @@
+"""Export of meter readings to CSV or Parquet files."""
+
+from __future__ import annotations
+
+import csv
+import os
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from .readings import MeterReadings, format_read_at
+from .tariff import MeterCosts
+
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+FORMATS = [FORMAT_CSV, FORMAT_PARQUET]
+
+COLUMNS = ("read_at", "consumption", "read", "cost")
+# Rows held in memory, and written as one Parquet row group, at a time.
+CHUNK_ROWS = 10_000
+
+# (timestamp, consumption, read, cost)
+Row = tuple[int, float, float, float]
+
+
+def iter_chunks(
+    readings: MeterReadings,
+    costs: MeterCosts,
+    start: float | None = None,
+    end: float | None = None,
+    size: int = CHUNK_ROWS,
+) -> Iterator[list[Row]]:
+    """Yield the rows in [start, end) in chunks of at most size rows.
+
+    Each chunk is looked up by timestamp rather than index, so readings
+    merged by a refresh between two chunks do not shift the rows.
+    """
+    while True:
+        costs.update()
+        lo, hi = readings.bounds(start, end)
+        hi = min(hi, lo + size)
+        if lo >= hi:
+            return
+        yield [
+            (timestamp, consumption, read, cost)
+            for (timestamp, consumption, read), cost in zip(
+                readings.slice(lo, hi), costs.cost[lo:hi]
+            )
+        ]
+        start = readings.timestamps[hi - 1] + 1
+
+
+class ExportWriter(ABC):
+    """Write chunks of rows to an export file.
+
+    All methods do file I/O and run in the executor.
+    """
+
+    def __init__(self, path: Path, append: bool) -> None:
+        """Initialize."""
+        self.path = path
+        self.append = append
+        self.rows = 0
+
+    @abstractmethod
+    def last_timestamp(self) -> int | None:
+        """Return the timestamp of the newest exported row."""
+
+    @abstractmethod
+    def write(self, rows: list[Row]) -> None:
+        """Write a chunk of rows."""
+
+    def close(self) -> None:
+        """Finish the export."""
+
+
+class CsvExportWriter(ExportWriter):
+    """Write readings to a CSV file, appending to an earlier export."""
+
+    def __init__(self, path: Path, append: bool) -> None:
+        """Initialize."""
+        super().__init__(path, append)
+        self._file: IO[str] | None = None
+
+    def last_timestamp(self) -> int | None:
+        """Return the timestamp in the last line of the file."""
+        if not self.append or not self.path.is_file():
+            return None
+        with self.path.open("rb") as file:
+            size = file.seek(0, os.SEEK_END)
+            # The last line is well within the last kilobyte.
+            file.seek(max(0, size - 1024))
+            lines = file.read().decode().splitlines()
+        for line in reversed(lines):
+            try:
+                return int(datetime.fromisoformat(line.split(",")[0]).timestamp())
+            except ValueError:
+                continue
+        return None
+
+    def write(self, rows: list[Row]) -> None:
+        """Write a chunk of rows, starting the file on the first chunk."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a" if self.append else "w", newline="")
+            if self._file.tell() == 0:
+                csv.writer(self._file).writerow(COLUMNS)
+        csv.writer(self._file).writerows(
+            (format_read_at(timestamp), consumption, read, cost)
+            for timestamp, consumption, read, cost in rows
+        )
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ParquetExportWriter(ExportWriter):
+    """Write readings to a directory of Parquet files.
+
+    Parquet files cannot be appended to, so each export adds a part file
+    named after its first and last timestamp, written one row group per
+    chunk. Requires pyarrow, raises ImportError without it.
+    """
+
+    PART = re.compile(r"^(\d+)-(\d+)\.parquet$")
+
+    def __init__(self, path: Path, append: bool) -> None:
+        """Initialize."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(path, append)
+        self._pa = pa
+        self._pq = pq
+        self._schema = pa.schema([
+            ("read_at", pa.timestamp("s", tz="UTC")),
+            ("consumption", pa.float64()),
+            ("read", pa.float64()),
+            ("cost", pa.float64()),
+        ])
+        self._writer: Any = None
+        self._first: int | None = None
+        self._last: int | None = None
+
+    def _parts(self) -> list[tuple[Path, int]]:
+        """Return the part files of earlier exports with their last timestamp."""
+        if not self.path.is_dir():
+            return []
+        return [
+            (part, int(match.group(2)))
+            for part in self.path.iterdir()
+            if (match := self.PART.match(part.name))
+        ]
+
+    def last_timestamp(self) -> int | None:
+        """Return the newest timestamp of all part files."""
+        if not self.append:
+            return None
+        return max((last for _, last in self._parts()), default=None)
+
+    @property
+    def _partial(self) -> Path:
+        """Return the file written until the export is complete."""
+        return self.path / f".{self._first}.parquet.partial"
+
+    def write(self, rows: list[Row]) -> None:
+        """Write a chunk of rows as a row group."""
+        if self._writer is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            if not self.append:
+                for part, _ in self._parts():
+                    part.unlink()
+            self._first = rows[0][0]
+            self._writer = self._pq.ParquetWriter(str(self._partial), self._schema)
+        timestamps, consumption, reads, costs = zip(*rows)
+        self._writer.write_table(
+            self._pa.table(
+                [
+                    self._pa.array(timestamps, self._schema.field("read_at").type),
+                    self._pa.array(consumption, self._pa.float64()),
+                    self._pa.array(reads, self._pa.float64()),
+                    self._pa.array(costs, self._pa.float64()),
+                ],
+                schema=self._schema,
+            )
+        )
+        self._last = rows[-1][0]
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        """Close the part file and give it its final name."""
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        self._partial.rename(self.path / f"{self._first}-{self._last}.parquet")
+
+
+WRITERS: dict[str, type[ExportWriter]] = {
+    FORMAT_CSV: CsvExportWriter,
+    FORMAT_PARQUET: ParquetExportWriter,
+}
@@ -0,0 +1,156 @@
+"""Consumption forecasts for Anglian Water meters."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .aggregates import PERIOD_BILLING, PERIOD_MONTH, billing_period_start, period_bounds
+from .readings import HOUR, MeterReadings
+from .tariff import MeterCosts, Tariff
+
+# Readings used to build a profile when there is no saved state.
+HISTORY = timedelta(weeks=8)
+# Weight of each new reading in the average of its hour of the week.
+ALPHA = 0.1
+WEEK_HOURS = 24 * 7
+# Periods projected to their end.
+FORECAST_PERIODS = (PERIOD_MONTH, PERIOD_BILLING)
+
+
+def _hour_of_week(timestamp: float) -> int:
+    """Return the local hour of the week a reading covers."""
+    start = dt_util.as_local(dt_util.utc_from_timestamp(timestamp - HOUR))
+    return start.weekday() * 24 + start.hour
+
+
+def period_ends(today: date) -> dict[str, date]:
+    """Return the last day of each forecast period containing today."""
+    billing_start = billing_period_start(today)
+    return {
+        PERIOD_MONTH: (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+        - timedelta(days=1),
+        PERIOD_BILLING: billing_start.replace(year=billing_start.year + 1)
+        - timedelta(days=1),
+    }
+
+
+class ConsumptionForecast:
+    """Expected hourly consumption of a meter by local hour of the week.
+
+    Each reading moves the average of its hour of the week towards it, an
+    exponentially weighted mean, so an update only reads the readings newer
+    than the last one seen and the profile follows seasonal change. The
+    state is saved with the cache, so a restart carries on from it.
+    """
+
+    def __init__(self, readings: MeterReadings) -> None:
+        """Initialize."""
+        self.readings = readings
+        self.profile: list[float | None] = [None] * WEEK_HOURS
+        self.processed: int | None = None
+
+    @classmethod
+    def from_dict(cls, readings: MeterReadings, data: dict) -> ConsumptionForecast:
+        """Restore a forecast saved by as_dict."""
+        forecast = cls(readings)
+        if len(data.get("profile", ())) == WEEK_HOURS:
+            forecast.profile = list(data["profile"])
+            forecast.processed = data.get("processed")
+        return forecast
+
+    def as_dict(self) -> dict:
+        """Return the state saved with the cache."""
+        return {"profile": self.profile, "processed": self.processed}
+
+    def update(self) -> int:
+        """Fold in readings not seen yet, return how many there were."""
+        if not self.readings:
+            return 0
+        if self.processed is None:
+            lo, hi = self.readings.bounds(
+                self.readings.last_timestamp - HISTORY.total_seconds()
+            )
+        else:
+            lo, hi = self.readings.bounds(self.processed + 1)
+        for timestamp, consumption, _ in self.readings.slice(lo, hi):
+            hour = _hour_of_week(timestamp)
+            average = self.profile[hour]
+            self.profile[hour] = (
+                consumption if average is None
+                else average + ALPHA * (consumption - average)
+            )
+            self.processed = timestamp
+        return hi - lo
+
+    def _hourly(self) -> list[float] | None:
+        """Return the profile with unseen hours filled by the mean of the rest."""
+        seen = [average for average in self.profile if average is not None]
+        if not seen:
+            return None
+        mean = sum(seen) / len(seen)
+        return [mean if average is None else average for average in self.profile]
+
+    def curve(self, after: float, hours: int) -> list[tuple[int, float]]:
+        """Return (timestamp, consumption) of the hours following a reading.
+
+        Hours of the week are counted on from the first hour, so after a
+        daylight saving change the profile is an hour out.
+        """
+        if (hourly := self._hourly()) is None:
+            return []
+        first = int(after // HOUR * HOUR + HOUR)
+        hour = _hour_of_week(first)
+        return [
+            (first + step * HOUR, hourly[(hour + step) % WEEK_HOURS])
+            for step in range(hours)
+        ]
+
+    def expected(self, after: float, until: float) -> float | None:
+        """Return the consumption expected after one reading until another."""
+        if (hourly := self._hourly()) is None:
+            return None
+        hours = int((until - after) // HOUR)
+        if hours <= 0:
+            return 0.0
+        weeks, rest = divmod(hours, WEEK_HOURS)
+        return weeks * sum(hourly) + sum(
+            consumption for _, consumption in self.curve(after, rest)
+        )
+
+    def projections(
+        self,
+        costs: MeterCosts,
+        tariff: Tariff,
+        so_far: dict[str, float],
+        today: date | None = None,
+    ) -> dict[str, dict]:
+        """Return the projected consumption and cost at the end of each period.
+
+        so_far holds the consumption of each period up to today, as given by
+        MeterAggregates.totals. Costs are volumetric, like the cost sensors.
+        """
+        today = today or dt_util.now().date()
+        bounds = period_bounds(today)
+        ends = period_ends(today)
+        projections = {}
+        for period in FORECAST_PERIODS:
+            start = dt_util.start_of_local_day(bounds[period][0]).timestamp()
+            end = dt_util.start_of_local_day(
+                ends[period] + timedelta(days=1)
+            ).timestamp()
+            after = max(start, self.readings.last_timestamp or start)
+            remaining = self.expected(after, end)
+            if remaining is None:
+                projections[period] = {
+                    "end": ends[period], "consumption": None, "cost": None
+                }
+                continue
+            projections[period] = {
+                "end": ends[period],
+                "consumption": so_far[period] + remaining,
+                "cost": costs.cost_between(start, end)
+                + remaining * tariff.period_at(after).volumetric_rate / 1000,
+            }
+        return projections
@@ -0,0 +1,148 @@
+"""Leak detection over Anglian Water hourly readings."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import timedelta
+from enum import StrEnum
+
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .readings import HOUR, MeterReadings
+
+EVENT_LEAK_DETECTED = f"{DOMAIN}_leak_detected"
+
+# Readings replayed to prime a detector after a restart.
+HISTORY = timedelta(days=14)
+# Local hours (start of the reading) treated as night.
+NIGHT_HOURS = range(1, 5)
+# Lowest night hour consumption, in litres, that counts as night flow.
+NIGHT_FLOW_THRESHOLD = 1.0
+# Hours of consumption averaged into the spike baseline.
+BASELINE_HOURS = 24 * 7
+# Baseline hours needed before spikes are reported.
+BASELINE_MIN_HOURS = 24
+# An hour is a spike when it exceeds the baseline by this factor...
+SPIKE_FACTOR = 5.0
+# ...and this many litres.
+SPIKE_MIN_CONSUMPTION = 100.0
+# How long after a spike it is still reported.
+SPIKE_HOLD = 24 * HOUR
+
+
+class LeakType(StrEnum):
+    """Patterns in the readings that suggest a leak."""
+
+    CONTINUOUS_FLOW = "continuous_flow"
+    NIGHT_FLOW = "night_flow"
+    SPIKE = "spike"
+
+
+class LeakDetector:
+    """Look for leak patterns in the hourly readings of a meter.
+
+    Only readings newer than the last one seen are processed, carrying the
+    running state (current flow run, night minimum and a rolling baseline
+    window) from one refresh to the next.
+    """
+
+    def __init__(self, readings: MeterReadings, continuous_hours: int) -> None:
+        """Initialize."""
+        self.readings = readings
+        self.continuous_hours = continuous_hours
+        self.processed: int | None = None
+        self.flow_hours = 0
+        self.night_flow: float | None = None
+        self.spike_at: int | None = None
+        self.spike_consumption: float | None = None
+        self._night_min: float | None = None
+        self._window: deque[float] = deque(maxlen=BASELINE_HOURS)
+        self._window_sum = 0.0
+
+    @property
+    def active(self) -> set[LeakType]:
+        """Return the leak patterns currently present."""
+        active = set()
+        if self.flow_hours >= self.continuous_hours:
+            active.add(LeakType.CONTINUOUS_FLOW)
+        if self.night_flow is not None and self.night_flow >= NIGHT_FLOW_THRESHOLD:
+            active.add(LeakType.NIGHT_FLOW)
+        if (
+            self.spike_at is not None
+            and self.processed is not None
+            and self.processed - self.spike_at < SPIKE_HOLD
+        ):
+            active.add(LeakType.SPIKE)
+        return active
+
+    @property
+    def baseline(self) -> float | None:
+        """Return the mean hourly consumption of the baseline window."""
+        if len(self._window) < BASELINE_MIN_HOURS:
+            return None
+        return self._window_sum / len(self._window)
+
+    def _step(self, timestamp: int, consumption: float) -> None:
+        """Advance the running state by one reading."""
+        if self.processed is not None and timestamp - self.processed >= 2 * HOUR:
+            # Flow over missing hours is unknown, start counting again.
+            self.flow_hours = 0
+        self.processed = timestamp
+
+        self.flow_hours = self.flow_hours + 1 if consumption > 0 else 0
+
+        baseline = self.baseline
+        if baseline is not None and consumption >= max(
+            SPIKE_MIN_CONSUMPTION, baseline * SPIKE_FACTOR
+        ):
+            self.spike_at = timestamp
+            self.spike_consumption = consumption
+        if len(self._window) == BASELINE_HOURS:
+            self._window_sum -= self._window[0]
+        self._window.append(consumption)
+        self._window_sum += consumption
+
+        hour = dt_util.as_local(dt_util.utc_from_timestamp(timestamp - HOUR)).hour
+        if hour in NIGHT_HOURS:
+            self._night_min = (
+                consumption if self._night_min is None
+                else min(self._night_min, consumption)
+            )
+        elif self._night_min is not None:
+            self.night_flow = self._night_min
+            self._night_min = None
+
+    def update(self) -> set[LeakType]:
+        """Process readings not seen yet, return patterns that just appeared."""
+        if not self.readings:
+            return set()
+        before = self.active
+        spike_at = self.spike_at
+        if self.processed is None:
+            lo, hi = self.readings.bounds(
+                self.readings.last_timestamp - HISTORY.total_seconds()
+            )
+        else:
+            lo, hi = self.readings.bounds(self.processed + 1)
+        for timestamp, consumption, _ in self.readings.slice(lo, hi):
+            self._step(timestamp, consumption)
+        appeared = self.active - before
+        if self.spike_at != spike_at and LeakType.SPIKE in self.active:
+            # A new spike within the hold time of an earlier one. Spikes
+            # replayed from older readings are not reported.
+            appeared.add(LeakType.SPIKE)
+        return appeared
+
+    def as_dict(self) -> dict:
+        """Return the detector state."""
+        return {
+            "flow_hours": self.flow_hours,
+            "night_flow": self.night_flow,
+            "baseline": self.baseline,
+            "spike_consumption": self.spike_consumption,
+            "spike_at": (
+                None if self.spike_at is None
+                else dt_util.utc_from_timestamp(self.spike_at).isoformat()
+            ),
+        }
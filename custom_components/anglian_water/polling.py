@@ -0,0 +1,79 @@
+"""Adaptive polling schedule for Anglian Water smart meter data."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+# Weight kept from previous observations each time new data arrives.
+ARRIVAL_DECAY = 0.9
+# Share of the busiest hour's weight for an hour to count as a window.
+WINDOW_THRESHOLD = 0.5
+
+
+class AdaptivePollingSchedule:
+    """Learn when new readings are published and poll around that.
+
+    While nothing new arrives the interval doubles up to the maximum. Each
+    time new readings appear the local hour is recorded, and polling
+    returns to the minimum interval during the hours data usually lands.
+    """
+
+    def __init__(self, min_interval: timedelta, max_interval: timedelta) -> None:
+        """Initialize."""
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.interval = min_interval
+        self.arrivals: list[float] = [0.0] * 24
+
+    @property
+    def expected_hours(self) -> list[int]:
+        """Return the local hours new readings usually arrive in."""
+        peak = max(self.arrivals)
+        if peak == 0:
+            return []
+        return [
+            hour for hour, weight in enumerate(self.arrivals)
+            if weight >= peak * WINDOW_THRESHOLD
+        ]
+
+    def _record_arrival(self, now: datetime) -> None:
+        """Record that new readings were seen at this time."""
+        self.arrivals = [weight * ARRIVAL_DECAY for weight in self.arrivals]
+        self.arrivals[now.hour] += 1
+
+    def _until_next_window(self, now: datetime) -> timedelta | None:
+        """Return the time until the next expected publication hour starts."""
+        hours = self.expected_hours
+        if not hours:
+            return None
+        if now.hour in hours:
+            return timedelta(0)
+        top_of_hour = now.replace(minute=0, second=0, microsecond=0)
+        ahead = min((hour - now.hour) % 24 for hour in hours)
+        return top_of_hour + timedelta(hours=ahead) - now
+
+    def next_interval(
+        self, new_data: bool, now: datetime | None = None
+    ) -> timedelta:
+        """Return the delay before the next poll."""
+        now = dt_util.as_local(now or dt_util.now())
+        if new_data:
+            self._record_arrival(now)
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        until_window = self._until_next_window(now)
+        if until_window is None:
+            return self.interval
+        return max(self.min_interval, min(self.interval, until_window))
+
+    def as_dict(self) -> dict:
+        """Return the schedule state."""
+        return {
+            "interval": self.interval.total_seconds(),
+            "min_interval": self.min_interval.total_seconds(),
+            "max_interval": self.max_interval.total_seconds(),
+            "expected_hours": self.expected_hours,
+        }
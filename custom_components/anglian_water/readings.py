@@ -0,0 +1,231 @@
+"""Compact store of parsed Anglian Water meter readings."""
+
+from __future__ import annotations
+
+import base64
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+HOUR = 3600
+
+GRANULARITY_HOURLY = "hourly"
+GRANULARITY_DAILY = "daily"
+GRANULARITY_MONTHLY = "monthly"
+GRANULARITIES = [GRANULARITY_HOURLY, GRANULARITY_DAILY, GRANULARITY_MONTHLY]
+
+
+def parse_read_at(value: str) -> int:
+    """Convert a read_at string from the API into epoch seconds."""
+    return int(dt_util.as_local(dt_util.parse_datetime(value)).timestamp())
+
+
+def format_read_at(timestamp: float) -> str:
+    """Convert epoch seconds back into a local read_at string."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
+
+
+class MeterReadings:
+    """Hourly readings of a single meter held in typed arrays.
+
+    Rows are kept sorted by read time. Each timestamp marks the end of the
+    hour the consumption was measured over.
+    """
+
+    __slots__ = ("consumption", "reads", "timestamps")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.timestamps = array("q")
+        self.consumption = array("d")
+        self.reads = array("d")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str]) -> MeterReadings:
+        """Restore readings saved with as_dict."""
+        readings = cls()
+        for column in cls.__slots__:
+            getattr(readings, column).frombytes(base64.b64decode(data[column]))
+        return readings
+
+    def as_dict(self) -> dict[str, str]:
+        """Return the columns encoded for storage."""
+        return {
+            column: base64.b64encode(getattr(self, column).tobytes()).decode()
+            for column in self.__slots__
+        }
+
+    def __len__(self) -> int:
+        """Return the number of stored readings."""
+        return len(self.timestamps)
+
+    @property
+    def first_timestamp(self) -> int | None:
+        """Return the timestamp of the oldest reading."""
+        return self.timestamps[0] if self.timestamps else None
+
+    @property
+    def last_timestamp(self) -> int | None:
+        """Return the timestamp of the newest reading."""
+        return self.timestamps[-1] if self.timestamps else None
+
+    @property
+    def latest_read(self) -> float:
+        """Return the newest meter read."""
+        return self.reads[-1] if self.reads else 0.0
+
+    @property
+    def latest_consumption(self) -> float:
+        """Return the consumption of the newest reading."""
+        return self.consumption[-1] if self.consumption else 0.0
+
+    def _put(self, timestamp: int, consumption: float, read: float) -> bool:
+        """Insert or replace a single row, return True if anything changed."""
+        if not self.timestamps or timestamp > self.timestamps[-1]:
+            self.timestamps.append(timestamp)
+            self.consumption.append(consumption)
+            self.reads.append(read)
+            return True
+        index = bisect_left(self.timestamps, timestamp)
+        if index < len(self.timestamps) and self.timestamps[index] == timestamp:
+            if (
+                self.consumption[index] == consumption
+                and self.reads[index] == read
+            ):
+                return False
+            self.consumption[index] = consumption
+            self.reads[index] = read
+            return True
+        self.timestamps.insert(index, timestamp)
+        self.consumption.insert(index, consumption)
+        self.reads.insert(index, read)
+        return True
+
+    def extend(self, readings: Iterable[dict]) -> int | None:
+        """Merge readings from the API.
+
+        Return the timestamp of the earliest row that changed, or None if
+        nothing did.
+        """
+        changed_from = None
+        for reading in readings:
+            timestamp = parse_read_at(reading["read_at"])
+            if self._put(
+                timestamp, float(reading["consumption"]), float(reading["read"])
+            ) and (changed_from is None or timestamp < changed_from):
+                changed_from = timestamp
+        return changed_from
+
+    def bounds(
+        self, start: float | None = None, end: float | None = None
+    ) -> tuple[int, int]:
+        """Return the index range of readings with start <= timestamp < end."""
+        lo = 0 if start is None else bisect_left(self.timestamps, start)
+        hi = len(self.timestamps) if end is None else bisect_left(self.timestamps, end)
+        return lo, max(lo, hi)
+
+    def consumption_between(self, start: float, end: float) -> float:
+        """Return the total consumption for readings in [start, end)."""
+        lo, hi = self.bounds(start, end)
+        return sum(self.consumption[lo:hi])
+
+    def gaps(
+        self, start: float | None = None, end: float | None = None
+    ) -> list[tuple[int, int]]:
+        """Return runs of missing hours between readings in [start, end).
+
+        Each run is given as the timestamps of its first and last missing
+        reading.
+        """
+        lo, hi = self.bounds(start, end)
+        timestamps = self.timestamps[lo:hi]
+        return [
+            (previous + HOUR, current - HOUR)
+            for previous, current in zip(timestamps, timestamps[1:])
+            if current - previous >= 2 * HOUR
+        ]
+
+    def rows(
+        self, start: float | None = None, end: float | None = None
+    ) -> Iterator[tuple[int, float, float]]:
+        """Yield (timestamp, consumption, read) rows in [start, end)."""
+        return self.slice(*self.bounds(start, end))
+
+    def slice(self, lo: int, hi: int) -> Iterator[tuple[int, float, float]]:
+        """Yield (timestamp, consumption, read) rows with index in [lo, hi)."""
+        return zip(
+            self.timestamps[lo:hi], self.consumption[lo:hi], self.reads[lo:hi]
+        )
+
+    def as_dicts(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        costs: Sequence[float] | None = None,
+    ) -> list[dict]:
+        """Return readings in [start, end) in the API's dict layout.
+
+        If costs aligned with the readings are given each reading also
+        carries its consumption_cost.
+        """
+        lo, hi = self.bounds(start, end)
+        output = [
+            {
+                "read_at": format_read_at(timestamp),
+                "consumption": consumption,
+                "read": read,
+            }
+            for timestamp, consumption, read in self.slice(lo, hi)
+        ]
+        if costs is not None:
+            for reading, cost in zip(output, costs[lo:hi]):
+                reading["consumption_cost"] = cost
+        return output
+
+    def tail(self, count: int) -> list[dict]:
+        """Return the newest readings in the API's dict layout."""
+        if count <= 0 or not self.timestamps:
+            return []
+        return self.as_dicts(self.timestamps[-min(count, len(self.timestamps))])
+
+    def resample(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        granularity: str = GRANULARITY_HOURLY,
+        costs: Sequence[float] | None = None,
+    ) -> list[dict]:
+        """Return readings in [start, end) summed into local days or months."""
+        if granularity == GRANULARITY_HOURLY:
+            return self.as_dicts(start, end, costs)
+        output: list[dict] = []
+        boundary = None
+        lo, hi = self.bounds(start, end)
+        for index, (timestamp, consumption, read) in enumerate(
+            self.slice(lo, hi), lo
+        ):
+            if boundary is None or timestamp >= boundary:
+                bucket = dt_util.start_of_local_day(dt_util.as_local(
+                    dt_util.utc_from_timestamp(timestamp)
+                ).date())
+                if granularity == GRANULARITY_MONTHLY:
+                    bucket = bucket.replace(day=1)
+                    following = (bucket + timedelta(days=32)).replace(day=1)
+                else:
+                    following = bucket + timedelta(days=1)
+                boundary = dt_util.start_of_local_day(following.date()).timestamp()
+                output.append({
+                    "read_at": bucket.isoformat(),
+                    "consumption": 0.0,
+                    "read": read,
+                })
+                if costs is not None:
+                    output[-1]["consumption_cost"] = 0.0
+            output[-1]["consumption"] += consumption
+            output[-1]["read"] = read
+            if costs is not None:
+                output[-1]["consumption_cost"] += costs[index]
+        return output
@@ -0,0 +1,83 @@
+"""Integration wide scheduling of Anglian Water refreshes."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .circuit import CircuitBreaker
+
+# Refreshes allowed to talk to Anglian Water at the same time.
+MAX_CONCURRENT_REFRESHES = 2
+# Refreshes allowed to start within RATE_WINDOW seconds.
+RATE_LIMIT = 20
+RATE_WINDOW = 600
+# Gap between the refreshes of consecutive accounts.
+STAGGER_STEP = timedelta(minutes=1)
+
+
+class AnglianWaterScheduler:
+    """Spread the refreshes of every account over the Anglian Water API.
+
+    All coordinators refresh through a shared slot, which caps how many
+    run at once and how many start per window. The circuit breaker is
+    shared too, so when one account sees the service as unavailable every
+    account stops calling it.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.circuit = CircuitBreaker(hass)
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REFRESHES)
+        self._started: deque[float] = deque()
+        self._accounts: set[str] = set()
+
+    @callback
+    def async_register(self, entry_id: str) -> CALLBACK_TYPE:
+        """Register an account, return a callback to remove it."""
+        self._accounts.add(entry_id)
+
+        @callback
+        def _remove() -> None:
+            self._accounts.discard(entry_id)
+
+        return _remove
+
+    def stagger(self, entry_id: str, interval: timedelta) -> timedelta:
+        """Return the offset keeping an account out of step with the others.
+
+        The offset is a phase, it is applied to one refresh only so every
+        account keeps polling at its configured interval.
+        """
+        if entry_id not in self._accounts or len(self._accounts) < 2:
+            return timedelta(0)
+        step = min(STAGGER_STEP, interval / len(self._accounts))
+        return step * sorted(self._accounts).index(entry_id)
+
+    async def _async_wait_for_budget(self) -> None:
+        """Wait until starting another refresh stays within the rate budget."""
+        while True:
+            now = time.monotonic()
+            while self._started and self._started[0] <= now - RATE_WINDOW:
+                self._started.popleft()
+            if len(self._started) < RATE_LIMIT:
+                self._started.append(now)
+                return
+            await asyncio.sleep(self._started[0] + RATE_WINDOW - now)
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncGenerator[None]:
+        """Hold one of the shared refresh slots.
+
+        Raises CircuitOpenError without waiting while the circuit is open.
+        """
+        with self.circuit.call():
+            async with self._semaphore:
+                await self._async_wait_for_budget()
+                yield
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from typing import Any
 from dataclasses import dataclass
+from datetime import timedelta
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -13,14 +15,35 @@ from homeassistant.components.sensor import (
 )
 
 from homeassistant.const import (
+    UnitOfInformation,
+    UnitOfTime,
     UnitOfVolume
 )
+from homeassistant.util import dt as dt_util
 
 from pyanglianwater import SmartMeter
 
+from .aggregates import (
+    PERIOD_BILLING,
+    PERIOD_BILLING_LAST_YEAR,
+    PERIOD_MONTH,
+    PERIOD_TODAY,
+    PERIOD_WEEK,
+)
 from .const import DOMAIN
 from .coordinator import AnglianWaterDataUpdateCoordinator
-from .entity import AnglianWaterEntity
+from .entity import (
+    AnglianWaterAccountEntity,
+    AnglianWaterEntity,
+    async_migrate_unique_ids,
+)
+from .statistics import StatisticKind
+
+
+def _yesterday() -> tuple[float, float]:
+    """Return the timestamp range of readings taken yesterday."""
+    today = dt_util.start_of_local_day()
+    return (today - timedelta(days=1)).timestamp(), today.timestamp()
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -28,9 +51,10 @@ class AnglianWaterSensorEntityDescription(SensorEntityDescription):
     """Describes AnglianWater sensor entity."""
 
     key: str
-    value_fn: Callable[[SmartMeter],
+    value_fn: Callable[[SmartMeter, AnglianWaterDataUpdateCoordinator],
                        float] | None = None
     name_fn: Callable[[SmartMeter], str] | None = None
+    statistic: StatisticKind | None = None
 
 
 ENTITY_DESCRIPTIONS: dict[str, AnglianWaterSensorEntityDescription] = {
@@ -40,7 +64,9 @@ ENTITY_DESCRIPTIONS: dict[str, AnglianWaterSensorEntityDescription] = {
         icon="mdi:water",
         native_unit_of_measurement=UnitOfVolume.LITERS,
         device_class=SensorDeviceClass.WATER,
-        value_fn=lambda entity: entity.get_yesterday_consumption,
+        value_fn=lambda entity, coordinator: coordinator.meter_readings(
+            entity
+        ).consumption_between(*_yesterday()),
         state_class=SensorStateClass.TOTAL
     ),
     "anglian_water_previous_cost": AnglianWaterSensorEntityDescription(
@@ -49,7 +75,9 @@ ENTITY_DESCRIPTIONS: dict[str, AnglianWaterSensorEntityDescription] = {
         icon="mdi:cash",
         native_unit_of_measurement="GBP",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda entity: entity.get_yesterday_cost,
+        value_fn=lambda entity, coordinator: coordinator.meter_costs(
+            entity
+        ).cost_between(*_yesterday()),
         state_class=SensorStateClass.TOTAL
     ),
     "anglian_water_latest_reading": AnglianWaterSensorEntityDescription(
@@ -58,8 +86,11 @@ ENTITY_DESCRIPTIONS: dict[str, AnglianWaterSensorEntityDescription] = {
         icon="mdi:water",
         native_unit_of_measurement=UnitOfVolume.CUBIC_METERS,
         device_class=SensorDeviceClass.WATER,
-        value_fn=lambda entity: entity.latest_read,
-        state_class=SensorStateClass.TOTAL_INCREASING
+        value_fn=lambda entity, coordinator: coordinator.meter_readings(
+            entity
+        ).latest_read,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        statistic=StatisticKind.CONSUMPTION
     ),
     "anglian_water_latest_cost": AnglianWaterSensorEntityDescription(
         key="anglian_water_latest_cost",
@@ -67,8 +98,159 @@ ENTITY_DESCRIPTIONS: dict[str, AnglianWaterSensorEntityDescription] = {
         icon="mdi:cash",
         native_unit_of_measurement="GBP",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda entity: entity.latest_read * entity.tariff_rate,
-        state_class=SensorStateClass.TOTAL
+        value_fn=lambda entity, coordinator: coordinator.meter_costs(
+            entity
+        ).latest_cumulative,
+        state_class=SensorStateClass.TOTAL,
+        statistic=StatisticKind.COST
+    ),
+    "anglian_water_today_consumption": AnglianWaterSensorEntityDescription(
+        key="anglian_water_today_consumption",
+        name_fn=lambda entity: f"{entity.serial_number} Today Consumption",
+        icon="mdi:water",
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda entity, coordinator: coordinator.meter_aggregates(
+            entity
+        ).totals()[PERIOD_TODAY]
+    ),
+    "anglian_water_week_consumption": AnglianWaterSensorEntityDescription(
+        key="anglian_water_week_consumption",
+        name_fn=lambda entity: f"{entity.serial_number} Week To Date Consumption",
+        icon="mdi:water",
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda entity, coordinator: coordinator.meter_aggregates(
+            entity
+        ).totals()[PERIOD_WEEK]
+    ),
+    "anglian_water_month_consumption": AnglianWaterSensorEntityDescription(
+        key="anglian_water_month_consumption",
+        name_fn=lambda entity: f"{entity.serial_number} Month To Date Consumption",
+        icon="mdi:water",
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda entity, coordinator: coordinator.meter_aggregates(
+            entity
+        ).totals()[PERIOD_MONTH]
+    ),
+    "anglian_water_billing_period_consumption": AnglianWaterSensorEntityDescription(
+        key="anglian_water_billing_period_consumption",
+        name_fn=lambda entity: f"{entity.serial_number} Billing Period Consumption",
+        icon="mdi:water",
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda entity, coordinator: coordinator.meter_aggregates(
+            entity
+        ).totals()[PERIOD_BILLING]
+    ),
+    "anglian_water_billing_period_last_year_consumption": AnglianWaterSensorEntityDescription(
+        key="anglian_water_billing_period_last_year_consumption",
+        name_fn=lambda entity: (
+            f"{entity.serial_number} Billing Period Last Year Consumption"
+        ),
+        icon="mdi:water",
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda entity, coordinator: coordinator.meter_aggregates(
+            entity
+        ).totals()[PERIOD_BILLING_LAST_YEAR]
+    ),
+    "anglian_water_projected_month_consumption": AnglianWaterSensorEntityDescription(
+        key="anglian_water_projected_month_consumption",
+        name_fn=lambda entity: f"{entity.serial_number} Projected Month Consumption",
+        icon="mdi:chart-timeline-variant-shimmer",
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        device_class=SensorDeviceClass.WATER,
+        value_fn=lambda entity, coordinator: coordinator.meter_projections(
+            entity
+        )[PERIOD_MONTH]["consumption"]
+    ),
+    "anglian_water_projected_month_cost": AnglianWaterSensorEntityDescription(
+        key="anglian_water_projected_month_cost",
+        name_fn=lambda entity: f"{entity.serial_number} Projected Month Cost",
+        icon="mdi:cash-clock",
+        native_unit_of_measurement="GBP",
+        device_class=SensorDeviceClass.MONETARY,
+        value_fn=lambda entity, coordinator: coordinator.meter_projections(
+            entity
+        )[PERIOD_MONTH]["cost"]
+    ),
+    "anglian_water_projected_billing_period_consumption": AnglianWaterSensorEntityDescription(
+        key="anglian_water_projected_billing_period_consumption",
+        name_fn=lambda entity: (
+            f"{entity.serial_number} Projected Billing Period Consumption"
+        ),
+        icon="mdi:chart-timeline-variant-shimmer",
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        device_class=SensorDeviceClass.WATER,
+        value_fn=lambda entity, coordinator: coordinator.meter_projections(
+            entity
+        )[PERIOD_BILLING]["consumption"]
+    ),
+    "anglian_water_projected_billing_period_cost": AnglianWaterSensorEntityDescription(
+        key="anglian_water_projected_billing_period_cost",
+        name_fn=lambda entity: (
+            f"{entity.serial_number} Projected Billing Period Cost"
+        ),
+        icon="mdi:cash-clock",
+        native_unit_of_measurement="GBP",
+        device_class=SensorDeviceClass.MONETARY,
+        value_fn=lambda entity, coordinator: coordinator.meter_projections(
+            entity
+        )[PERIOD_BILLING]["cost"]
+    ),
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class AnglianWaterMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes an AnglianWater refresh metric sensor."""
+
+    key: str
+    value_fn: Callable[[AnglianWaterDataUpdateCoordinator], Any]
+    attributes_fn: Callable[
+        [AnglianWaterDataUpdateCoordinator], dict[str, Any]
+    ] | None = None
+
+
+METRIC_DESCRIPTIONS: dict[str, AnglianWaterMetricSensorEntityDescription] = {
+    "anglian_water_refresh_duration": AnglianWaterMetricSensorEntityDescription(
+        key="anglian_water_refresh_duration",
+        name="Refresh Duration",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.last_refresh_record.get("duration"),
+        attributes_fn=lambda coordinator: {
+            **coordinator.last_refresh_record.get("phases", {}),
+            "meter_readings": coordinator.last_refresh_record.get("meter_readings"),
+        },
+    ),
+    "anglian_water_response_size": AnglianWaterMetricSensorEntityDescription(
+        key="anglian_water_response_size",
+        name="Response Size",
+        icon="mdi:download-network-outline",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.last_refresh_record.get(
+            "response_bytes"
+        ),
+    ),
+    "anglian_water_refresh_errors": AnglianWaterMetricSensorEntityDescription(
+        key="anglian_water_refresh_errors",
+        name="Refresh Errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.error_counts.total(),
+        attributes_fn=lambda coordinator: dict(coordinator.error_counts),
     ),
 }
 
@@ -76,6 +258,7 @@ ENTITY_DESCRIPTIONS: dict[str, AnglianWaterSensorEntityDescription] = {
 async def async_setup_entry(hass, entry, async_add_devices):
     """Set up the sensor platform."""
     coordinator: AnglianWaterDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    await async_migrate_unique_ids(hass, coordinator, ENTITY_DESCRIPTIONS)
     for meter in coordinator.client.meters.values():
         async_add_devices(
             GenericSensor(
@@ -85,13 +268,13 @@ async def async_setup_entry(hass, entry, async_add_devices):
             )
             for entity_description in ENTITY_DESCRIPTIONS.values()
         )
-
-    # platform = entity_platform.async_get_current_platform()
-    # platform.async_register_entity_service(
-    #     "migrate_statistics",
-    #     {},
-    #     "migrate_statistics",
-    # )
+    async_add_devices(
+        MetricSensor(
+            coordinator=coordinator,
+            entity_description=entity_description,
+        )
+        for entity_description in METRIC_DESCRIPTIONS.values()
+    )
 
 
 class GenericSensor(AnglianWaterEntity, SensorEntity):
@@ -106,18 +289,52 @@ class GenericSensor(AnglianWaterEntity, SensorEntity):
         """Initialize the sensor class."""
         super().__init__(coordinator, entity_description.key, meter)
         self.entity_description: AnglianWaterSensorEntityDescription = entity_description
+        self._attr_name = entity_description.name_fn(meter)
 
-    @property
-    def name(self) -> str:
-        """Return name of entity."""
-        return self.entity_description.name_fn(self.meter)
+    async def async_added_to_hass(self) -> None:
+        """Feed the meter statistics into this entity."""
+        await super().async_added_to_hass()
+        if self.entity_description.statistic is None:
+            return
+        self.async_on_remove(
+            self.coordinator.meter_statistics(self.meter).async_add_target(
+                self.entity_description.statistic,
+                self.entity_id,
+                self.name,
+                self.unit_of_measurement,
+            )
+        )
+
+    def _compute_state(self) -> Any:
+        """Compute the native value of the entity."""
+        self._attr_native_value = self.entity_description.value_fn(
+            self.meter, self.coordinator
+        )
+        return self._attr_native_value
+
+
+class MetricSensor(AnglianWaterAccountEntity, SensorEntity):
+    """anglian_water refresh metric sensor class."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: AnglianWaterDataUpdateCoordinator,
+        entity_description: AnglianWaterMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, entity_description.key)
+        self.entity_description: AnglianWaterMetricSensorEntityDescription = entity_description
 
     @property
     def native_value(self):
         """Return the native value of the entity."""
-        return self.entity_description.value_fn(self.meter)
+        return self.entity_description.value_fn(self.coordinator)
 
     @property
-    def device_class(self):
-        """Return device class."""
-        return self.entity_description.device_class
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the phase breakdown of the metric."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator)
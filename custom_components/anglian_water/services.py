@@ -0,0 +1,394 @@
+"""Services for Anglian Water."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .aggregates import period_bounds
+from .const import DOMAIN, LOGGER
+from .coordinator import AnglianWaterDataUpdateCoordinator
+from .export import FORMAT_CSV, FORMAT_PARQUET, FORMATS, WRITERS, iter_chunks
+from .readings import GRANULARITIES, GRANULARITY_HOURLY, MeterReadings, format_read_at
+
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_METER = "meter"
+ATTR_GRANULARITY = "granularity"
+ATTR_FORMAT = "format"
+ATTR_FILENAME = "filename"
+ATTR_APPEND = "append"
+ATTR_HOURS = "hours"
+
+SERVICE_FORCE_REFRESH_STATISTICS = "force_refresh_statistics"
+SERVICE_GET_READINGS = "get_readings"
+SERVICE_GET_AGGREGATES = "get_aggregates"
+SERVICE_EXPORT_READINGS = "export_readings"
+SERVICE_GET_FORECAST = "get_forecast"
+SERVICES = (
+    SERVICE_FORCE_REFRESH_STATISTICS,
+    SERVICE_GET_READINGS,
+    SERVICE_GET_AGGREGATES,
+    SERVICE_EXPORT_READINGS,
+    SERVICE_GET_FORECAST,
+)
+
+EVENT_STATISTICS_BACKFILL = f"{DOMAIN}_statistics_backfill"
+
+# Readings returned by get_readings without a start, the window the API
+# used to return.
+GET_READINGS_WINDOW = timedelta(days=7)
+
+FORCE_REFRESH_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_METER): cv.string,
+    }
+)
+
+GET_READINGS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_METER): cv.string,
+        vol.Optional(ATTR_GRANULARITY, default=GRANULARITY_HOURLY): vol.In(
+            GRANULARITIES
+        ),
+    }
+)
+
+GET_AGGREGATES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_METER): cv.string,
+    }
+)
+
+EXPORT_READINGS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_METER): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_FORMAT, default=FORMAT_CSV): vol.In(FORMATS),
+        vol.Optional(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_APPEND, default=False): cv.boolean,
+    }
+)
+
+GET_FORECAST_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_METER): cv.string,
+        vol.Optional(ATTR_HOURS, default=168): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=24 * 366)
+        ),
+        vol.Optional(ATTR_GRANULARITY, default=GRANULARITY_HOURLY): vol.In(
+            GRANULARITIES
+        ),
+    }
+)
+
+
+def _coordinators(hass: HomeAssistant) -> list[AnglianWaterDataUpdateCoordinator]:
+    """Return the coordinators of all loaded config entries."""
+    return [
+        coordinator for coordinator in hass.data.get(DOMAIN, {}).values()
+        if isinstance(coordinator, AnglianWaterDataUpdateCoordinator)
+    ]
+
+
+def _timestamp(call: ServiceCall, attr: str) -> float | None:
+    """Return a datetime service field as a timestamp."""
+    if (value := call.data.get(attr)) is None:
+        return None
+    return dt_util.as_local(value).timestamp()
+
+
+async def _async_get_readings(call: ServiceCall) -> ServiceResponse:
+    """Return cached readings, refreshing only if the range is not covered."""
+    end = _timestamp(call, ATTR_END)
+    if (start := _timestamp(call, ATTR_START)) is None:
+        start = (
+            dt_util.utcnow().timestamp() if end is None else end
+        ) - GET_READINGS_WINDOW.total_seconds()
+    serial_number = call.data.get(ATTR_METER)
+    granularity = call.data[ATTR_GRANULARITY]
+    response = {}
+    for coordinator in _coordinators(call.hass):
+        meters = [
+            meter for meter in coordinator.client.meters.values()
+            if serial_number in (None, meter.serial_number)
+        ]
+        if not meters:
+            continue
+        await coordinator.async_ensure_readings(end)
+        for meter in meters:
+            readings = coordinator.meter_readings(meter)
+            costs = coordinator.meter_costs(meter)
+            costs.update()
+            response[meter.serial_number] = {
+                "serial_number": meter.serial_number,
+                "granularity": granularity,
+                "last_reading": readings.latest_read,
+                "tariff_rate": coordinator.tariff.period_at().rate,
+                "consumption": readings.latest_consumption,
+                "readings": readings.resample(
+                    start, end, granularity, costs.cost
+                ),
+            }
+    if serial_number is not None and not response:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="meter_not_found",
+            translation_placeholders={"meter": serial_number},
+        )
+    return response
+
+
+async def _async_get_aggregates(call: ServiceCall) -> ServiceResponse:
+    """Return the rolling consumption and cost totals of each meter."""
+    serial_number = call.data.get(ATTR_METER)
+    response = {}
+    for coordinator in _coordinators(call.hass):
+        for meter in coordinator.client.meters.values():
+            if serial_number not in (None, meter.serial_number):
+                continue
+            totals = coordinator.meter_aggregates(meter).totals()
+            costs = coordinator.meter_costs(meter)
+            response[meter.serial_number] = {
+                period: {
+                    "consumption": totals[period],
+                    "cost": costs.cost_between(
+                        dt_util.start_of_local_day(first).timestamp(),
+                        dt_util.start_of_local_day(
+                            last + timedelta(days=1)
+                        ).timestamp(),
+                    ),
+                    "standing_charge": coordinator.tariff.standing_charge(
+                        first, last
+                    ),
+                }
+                for period, (first, last) in period_bounds(
+                    dt_util.now().date()
+                ).items()
+            }
+    if serial_number is not None and not response:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="meter_not_found",
+            translation_placeholders={"meter": serial_number},
+        )
+    return response
+
+
+async def _async_get_forecast(call: ServiceCall) -> ServiceResponse:
+    """Return projected period totals and the expected consumption curve."""
+    serial_number = call.data.get(ATTR_METER)
+    response = {}
+    for coordinator in _coordinators(call.hass):
+        for meter in coordinator.client.meters.values():
+            if serial_number not in (None, meter.serial_number):
+                continue
+            readings = coordinator.meter_readings(meter)
+            # Laid out as readings, continuing the meter read, so the curve
+            # can be summed into days or months like get_readings.
+            forecast = MeterReadings()
+            read = readings.latest_read
+            curve = []
+            for timestamp, consumption in coordinator.meter_forecast(meter).curve(
+                readings.last_timestamp or dt_util.utcnow().timestamp(),
+                call.data[ATTR_HOURS],
+            ):
+                read += consumption / 1000
+                curve.append({
+                    "read_at": format_read_at(timestamp),
+                    "consumption": consumption,
+                    "read": read,
+                })
+            forecast.extend(curve)
+            today = dt_util.now().date()
+            response[meter.serial_number] = {
+                "projections": {
+                    period: {
+                        **projection,
+                        "end": projection["end"].isoformat(),
+                        "standing_charge": coordinator.tariff.standing_charge(
+                            period_bounds(today)[period][0], projection["end"]
+                        ),
+                    }
+                    for period, projection in coordinator.meter_projections(
+                        meter
+                    ).items()
+                },
+                "forecast": forecast.resample(
+                    granularity=call.data[ATTR_GRANULARITY]
+                ),
+            }
+    if serial_number is not None and not response:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="meter_not_found",
+            translation_placeholders={"meter": serial_number},
+        )
+    return response
+
+
+def _export_path(call: ServiceCall, serial_number: str) -> Path:
+    """Return the export path, which has to be in the export directory."""
+    directory = Path(call.hass.config.path(DOMAIN, "exports")).resolve()
+    filename = call.data.get(ATTR_FILENAME)
+    if filename is None:
+        filename = (
+            serial_number if call.data[ATTR_FORMAT] == FORMAT_PARQUET
+            else f"{serial_number}.csv"
+        )
+    path = (directory / filename).resolve()
+    if not path.is_relative_to(directory) or path == directory:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_export_path",
+            translation_placeholders={"filename": filename},
+        )
+    return path
+
+
+async def _async_export_readings(call: ServiceCall) -> ServiceResponse:
+    """Stream the readings of a meter to a file in chunks."""
+    start = _timestamp(call, ATTR_START)
+    end = _timestamp(call, ATTR_END)
+    serial_number = call.data[ATTR_METER]
+    for coordinator in _coordinators(call.hass):
+        if (meter := coordinator.client.meters.get(serial_number)) is not None:
+            break
+    else:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="meter_not_found",
+            translation_placeholders={"meter": serial_number},
+        )
+    path = _export_path(call, serial_number)
+    try:
+        # The Parquet writer imports pyarrow, keep that off the event loop.
+        writer = await call.hass.async_add_executor_job(
+            WRITERS[call.data[ATTR_FORMAT]], path, call.data[ATTR_APPEND]
+        )
+    except ImportError as exc:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="parquet_unavailable",
+        ) from exc
+    last = await call.hass.async_add_executor_job(writer.last_timestamp)
+    if last is not None:
+        start = last + 1 if start is None else max(start, last + 1)
+    await coordinator.async_ensure_readings(end)
+    first = last = None
+    try:
+        for rows in iter_chunks(
+            coordinator.meter_readings(meter),
+            coordinator.meter_costs(meter),
+            start,
+            end,
+        ):
+            first = rows[0][0] if first is None else first
+            last = rows[-1][0]
+            await call.hass.async_add_executor_job(writer.write, rows)
+    finally:
+        await call.hass.async_add_executor_job(writer.close)
+    LOGGER.debug("Exported %s readings of %s to %s", writer.rows, serial_number, path)
+    return {
+        "path": str(path),
+        "rows": writer.rows,
+        "first": None if first is None else format_read_at(first),
+        "last": None if last is None else format_read_at(last),
+    }
+
+
+async def _async_force_refresh_statistics(call: ServiceCall) -> ServiceResponse:
+    """Rebuild long-term statistics for a range from the cached readings."""
+    start = _timestamp(call, ATTR_START)
+    end = _timestamp(call, ATTR_END)
+    serial_number = call.data.get(ATTR_METER)
+    response = {}
+    for coordinator in _coordinators(call.hass):
+        for meter in coordinator.client.meters.values():
+            if serial_number not in (None, meter.serial_number):
+                continue
+
+            def _progress(done: int, total: int, serial: str = meter.serial_number) -> None:
+                LOGGER.info(
+                    "Statistics backfill for %s: %s of %s readings", serial, done, total
+                )
+                call.hass.bus.async_fire(
+                    EVENT_STATISTICS_BACKFILL,
+                    {"meter": serial, "imported": done, "total": total},
+                )
+
+            response[meter.serial_number] = {
+                "imported": await coordinator.meter_statistics(meter).async_backfill(
+                    start, end, _progress
+                )
+            }
+    if serial_number is not None and not response:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="meter_not_found",
+            translation_placeholders={"meter": serial_number},
+        )
+    return response
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Anglian Water services."""
+    if hass.services.has_service(DOMAIN, SERVICE_GET_READINGS):
+        return
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_FORCE_REFRESH_STATISTICS,
+        service_func=_async_force_refresh_statistics,
+        schema=FORCE_REFRESH_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_GET_READINGS,
+        service_func=_async_get_readings,
+        schema=GET_READINGS_SCHEMA,
+        supports_response=SupportsResponse.ONLY
+    )
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_GET_AGGREGATES,
+        service_func=_async_get_aggregates,
+        schema=GET_AGGREGATES_SCHEMA,
+        supports_response=SupportsResponse.ONLY
+    )
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_EXPORT_READINGS,
+        service_func=_async_export_readings,
+        schema=EXPORT_READINGS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_GET_FORECAST,
+        service_func=_async_get_forecast,
+        schema=GET_FORECAST_SCHEMA,
+        supports_response=SupportsResponse.ONLY
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the Anglian Water services once the last entry is unloaded."""
+    for service in SERVICES:
+        hass.services.async_remove(DOMAIN, service)
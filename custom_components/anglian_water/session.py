@@ -0,0 +1,106 @@
+"""Shared HTTP sessions for Anglian Water accounts."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from aiohttp import ClientSession, CookieJar
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.json import json_loads
+from pyanglianwater.auth import MSOB2CAuth
+from pyanglianwater.const import AW_APP_BASEURL, AW_APP_ENDPOINTS
+from pyanglianwater.exceptions import (
+    ExpiredAccessTokenError,
+    InvalidAccountIdError,
+    ServiceUnavailableError,
+    UnknownEndpointError,
+)
+
+from .const import DATA_SESSIONS, LOGGER
+
+
+@callback
+def async_get_session(hass: HomeAssistant, username: str) -> ClientSession:
+    """Return the session shared by every entry of an account.
+
+    Sessions are built on Home Assistant's shared connector, which keeps
+    connections alive, limits connections per host and caches DNS. Each
+    account gets its own cookie jar for the B2C login.
+    """
+    sessions: dict[str, ClientSession] = hass.data.setdefault(DATA_SESSIONS, {})
+    key = username.casefold()
+    session = sessions.get(key)
+    if session is None or session.closed:
+        session = sessions[key] = async_create_clientsession(
+            hass, cookie_jar=CookieJar(quote_cookie=False)
+        )
+    return session
+
+
+@asynccontextmanager
+async def async_login_session(hass: HomeAssistant) -> AsyncGenerator[ClientSession]:
+    """Open a session for a config flow login, closed once it is done.
+
+    Flows log in on their own session with an empty cookie jar, so they do
+    not disturb the cookies of an entry already using the account session.
+    """
+    session = async_create_clientsession(
+        hass, auto_cleanup=False, cookie_jar=CookieJar(quote_cookie=False)
+    )
+    try:
+        yield session
+    finally:
+        # Home Assistant sessions share its connector, detach rather than
+        # close so the connector stays open.
+        session.detach()
+
+
+async def async_close_session(hass: HomeAssistant, username: str) -> None:
+    """Close the session of an account that is no longer configured."""
+    if session := hass.data.get(DATA_SESSIONS, {}).pop(username.casefold(), None):
+        session.detach()
+
+
+class AnglianWaterAuth(MSOB2CAuth):
+    """MSOB2CAuth that sends API requests over the account session.
+
+    The library opens a new ClientSession, and so a new TLS connection,
+    for every API request. This keeps them on the pooled session instead.
+    """
+
+    last_response_bytes: int = 0
+
+    async def send_request(self, endpoint: str, body: dict, **kwargs) -> dict:
+        """Send a request to the API, and return the JSON response."""
+        if endpoint not in AW_APP_ENDPOINTS:
+            raise ValueError("Provided API Endpoint does not exist.")
+        LOGGER.debug("Sending request to %s", endpoint)
+        endpoint_map = AW_APP_ENDPOINTS[endpoint]
+        await self.send_refresh_request()
+        if self.access_token is None:
+            raise ExpiredAccessTokenError()
+        built_url = AW_APP_BASEURL + endpoint_map["endpoint"].format(
+            ACCOUNT_ID=self.account_number, **kwargs
+        )
+        async with self._auth_session.request(
+            method=endpoint_map["method"],
+            url=built_url,
+            headers=self.get_authenticated_headers,
+            json=body,
+        ) as response:
+            LOGGER.debug(
+                "Request to %s returned with status %s", endpoint, response.status
+            )
+            if response.ok and response.content_type == "application/json":
+                payload = await response.read()
+                self.last_response_bytes = len(payload)
+                return json_loads(payload)
+            if response.status == 401:
+                raise ExpiredAccessTokenError()
+            if response.status == 403:
+                raise InvalidAccountIdError()
+            if response.status == 503:
+                raise ServiceUnavailableError(await response.text())
+            raise UnknownEndpointError(response.status, await response.text())
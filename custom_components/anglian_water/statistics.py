@@ -0,0 +1,252 @@
+"""Long-term statistics for Anglian Water smart meters.
+
+The recorder modules are imported when statistics are first read or
+written rather than with the integration.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import LOGGER
+from .readings import HOUR, MeterReadings
+
+if TYPE_CHECKING:
+    from homeassistant.components.recorder.models import (
+        StatisticData,
+        StatisticMetaData,
+    )
+    from pyanglianwater import SmartMeter
+
+    from .tariff import MeterCosts
+
+# Number of hourly readings imported per backfill window.
+BACKFILL_WINDOW = 24 * 7
+
+
+class StatisticKind(StrEnum):
+    """Statistic series produced for each meter."""
+
+    CONSUMPTION = "consumption"
+    COST = "cost"
+
+
+class _StatisticTarget:
+    """A statistic ID fed by the meter pipeline."""
+
+    def __init__(self, metadata: StatisticMetaData) -> None:
+        """Initialize."""
+        self.metadata = metadata
+        self.loaded = False
+        self.watermark: float | None = None
+
+
+class MeterStatistics:
+    """Build and import the long-term statistics of a single meter."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        meter: SmartMeter,
+        readings: MeterReadings,
+        costs: MeterCosts,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.meter = meter
+        self.readings = readings
+        self.costs = costs
+        self._targets: dict[StatisticKind, _StatisticTarget] = {}
+        self._lock = asyncio.Lock()
+
+    @callback
+    def async_add_target(
+        self,
+        kind: StatisticKind,
+        statistic_id: str,
+        name: str,
+        unit_of_measurement: str | None,
+    ) -> CALLBACK_TYPE:
+        """Feed a statistic ID from this meter, return a callback to stop."""
+        from homeassistant.components.recorder.models import StatisticMetaData
+
+        target = self._targets[kind] = _StatisticTarget(
+            StatisticMetaData(
+                source="recorder",
+                statistic_id=statistic_id,
+                name=name,
+                has_mean=False,
+                has_sum=True,
+                unit_of_measurement=unit_of_measurement,
+            )
+        )
+        self.hass.async_create_task(self.async_update())
+
+        @callback
+        def _remove() -> None:
+            if self._targets.get(kind) is target:
+                del self._targets[kind]
+
+        return _remove
+
+    async def _async_load_watermark(self, statistic_id: str) -> float | None:
+        """Return the start of the newest statistic held by the recorder."""
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.components.recorder.statistics import (
+            get_last_statistics,
+        )
+
+        last_stats = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+        )
+        if not last_stats.get(statistic_id):
+            return None
+        return last_stats[statistic_id][0]["start"]
+
+    async def _async_load_targets(self) -> dict[StatisticKind, _StatisticTarget]:
+        """Return the current targets with their watermarks loaded."""
+        targets = dict(self._targets)
+        for target in targets.values():
+            if not target.loaded:
+                target.watermark = await self._async_load_watermark(
+                    target.metadata["statistic_id"]
+                )
+                target.loaded = True
+        return targets
+
+    def _build_rows(
+        self,
+        targets: dict[StatisticKind, _StatisticTarget],
+        lo: int,
+        hi: int,
+        skip_imported: bool = True,
+    ) -> dict[StatisticKind, list[StatisticData]]:
+        """Convert readings with index in [lo, hi) into statistics."""
+        from homeassistant.components.recorder.models import StatisticData
+
+        statistics: dict[StatisticKind, list[StatisticData]] = {
+            kind: [] for kind in targets
+        }
+        self.costs.update()
+        rows = zip(
+            self.readings.slice(lo, hi),
+            self.costs.cost[lo:hi],
+            self.costs.cumulative[lo:hi],
+        )
+        for (timestamp, consumption, read), cost, cumulative in rows:
+            stat_start = timestamp - HOUR
+            for kind, target in targets.items():
+                if (
+                    skip_imported
+                    and target.watermark is not None
+                    and stat_start <= target.watermark
+                ):
+                    continue
+                if kind is StatisticKind.CONSUMPTION:
+                    statistics[kind].append(StatisticData(
+                        start=dt_util.utc_from_timestamp(stat_start),
+                        state=consumption/1000,
+                        sum=read
+                    ))
+                else:
+                    statistics[kind].append(StatisticData(
+                        start=dt_util.utc_from_timestamp(stat_start),
+                        state=cost,
+                        sum=cumulative
+                    ))
+        return statistics
+
+    def _import(
+        self,
+        targets: dict[StatisticKind, _StatisticTarget],
+        statistics: dict[StatisticKind, list[StatisticData]],
+    ) -> None:
+        """Queue statistics with the recorder and advance the watermarks."""
+        from homeassistant.components.recorder.statistics import (
+            async_import_statistics,
+        )
+
+        for kind, target in targets.items():
+            if not statistics[kind]:
+                continue
+            LOGGER.debug(
+                "Importing %s statistics for %s",
+                len(statistics[kind]),
+                target.metadata["statistic_id"],
+            )
+            async_import_statistics(
+                self.hass,
+                metadata=target.metadata,
+                statistics=statistics[kind]
+            )
+            target.watermark = max(
+                statistics[kind][-1]["start"].timestamp(),
+                target.watermark or 0,
+            )
+
+    async def async_update(self) -> None:
+        """Import readings newer than each statistic's watermark."""
+        async with self._lock:
+            if not self._targets or not self.readings:
+                return
+            targets = await self._async_load_targets()
+            # Readings are stamped at the end of the hour they cover, so a
+            # statistic starting at the watermark has a timestamp an hour on.
+            start = min(
+                -HOUR if target.watermark is None else target.watermark
+                for target in targets.values()
+            ) + HOUR
+            self._import(
+                targets, self._build_rows(targets, *self.readings.bounds(start))
+            )
+
+    async def async_import_range(
+        self, start: float | None = None, end: float | None = None
+    ) -> None:
+        """Import readings in [start, end), including ones behind the watermark.
+
+        Used for hours that arrived late, after newer statistics were
+        imported. Call async_update first so every target has a watermark.
+        """
+        async with self._lock:
+            if not self._targets:
+                return
+            targets = await self._async_load_targets()
+            self._import(targets, self._build_rows(
+                targets, *self.readings.bounds(start, end), skip_imported=False
+            ))
+
+    async def async_backfill(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> int:
+        """Rebuild statistics for readings in [start, end) in bounded windows.
+
+        Each window is handed to the recorder and the recorder queue is
+        drained before the next one is built, so memory use does not grow
+        with the length of the range.
+        """
+        from homeassistant.components.recorder import get_instance
+
+        async with self._lock:
+            if not self._targets:
+                return 0
+            targets = await self._async_load_targets()
+            lo, hi = self.readings.bounds(start, end)
+            for window_start in range(lo, hi, BACKFILL_WINDOW):
+                window_end = min(window_start + BACKFILL_WINDOW, hi)
+                self._import(targets, self._build_rows(
+                    targets, window_start, window_end, skip_imported=False
+                ))
+                await get_instance(self.hass).async_block_till_done()
+                if progress is not None:
+                    progress(window_end - lo, hi - lo)
+            return hi - lo
@@ -0,0 +1,186 @@
+"""Tariffs and cost series for Anglian Water meters."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+
+from .aggregates import BILLING_YEAR_START_MONTH
+from .readings import MeterReadings
+
+if TYPE_CHECKING:
+    from pyanglianwater import AnglianWater
+
+
+@dataclass(frozen=True)
+class TariffPeriod:
+    """Charges in force from the start of a billing year."""
+
+    start: float
+    # GBP per cubic metre.
+    rate: float = 0.0
+    sewerage_rate: float = 0.0
+    # GBP per year, the service charge is published as an annual amount.
+    service: float = 0.0
+    sewerage_service: float = 0.0
+
+    @property
+    def volumetric_rate(self) -> float:
+        """Return the combined water and sewerage charge per cubic metre."""
+        return self.rate + self.sewerage_rate
+
+    @property
+    def standing_charge(self) -> float:
+        """Return the combined water and sewerage charge per day."""
+        return (self.service + self.sewerage_service) / 365
+
+
+@dataclass(frozen=True)
+class Tariff:
+    """The charges of an account over time.
+
+    The tariff data from the library is keyed by billing year ("2025-26"),
+    each year starting on 1 April. A custom rate replaces the published
+    rate in every year.
+    """
+
+    periods: tuple[TariffPeriod, ...] = ()
+
+    @classmethod
+    def from_client(cls, client: AnglianWater) -> Tariff:
+        """Build the tariff from the client's tariff config."""
+        periods = []
+        for year, config in (client.tariff_config or {}).items():
+            try:
+                start_year = int(year.split("-")[0])
+            except (AttributeError, ValueError):
+                continue
+            if not isinstance(config, dict):
+                continue
+            periods.append(TariffPeriod(
+                start=dt_util.start_of_local_day(
+                    date(start_year, BILLING_YEAR_START_MONTH, 1)
+                ).timestamp(),
+                rate=float(config.get("rate", 0.0)),
+                sewerage_rate=float(config.get("sewerage_rate", 0.0)),
+                service=float(config.get("service", 0.0)),
+                sewerage_service=float(config.get("sewerage_service", 0.0)),
+            ))
+        periods.sort(key=lambda period: period.start)
+        if (custom_rate := client._custom_rate) is not None:
+            if not periods:
+                periods.append(TariffPeriod(start=0.0))
+            periods = [
+                TariffPeriod(
+                    start=period.start,
+                    rate=float(custom_rate),
+                    sewerage_rate=0.0,
+                    service=period.service,
+                    sewerage_service=period.sewerage_service,
+                )
+                for period in periods
+            ]
+        return cls(tuple(periods))
+
+    def index_at(self, timestamp: float) -> int:
+        """Return the index of the period in force at a timestamp."""
+        return max(
+            0, bisect_right([period.start for period in self.periods], timestamp) - 1
+        )
+
+    def period_at(self, timestamp: float | None = None) -> TariffPeriod:
+        """Return the period in force at a timestamp, or now."""
+        if not self.periods:
+            return TariffPeriod(start=0.0)
+        if timestamp is None:
+            timestamp = dt_util.utcnow().timestamp()
+        return self.periods[self.index_at(timestamp)]
+
+    def standing_charge(self, first: date, last: date) -> float:
+        """Return the standing charges from the first to the last day inclusive."""
+        if not self.periods:
+            return 0.0
+        total = 0.0
+        for ordinal in range(first.toordinal(), last.toordinal() + 1):
+            day = dt_util.start_of_local_day(date.fromordinal(ordinal))
+            total += self.period_at(day.timestamp()).standing_charge
+        return total
+
+
+class MeterCosts:
+    """Hourly and cumulative volumetric cost of a meter's readings.
+
+    Costs are held in arrays aligned with the readings and only the rows
+    from the first changed reading onwards are computed again. The
+    cumulative cost is the meter read priced at the rate in force plus an
+    offset that only changes where the rate does, so it does not depend on
+    which hours arrived first and a flat rate gives read * rate.
+    """
+
+    def __init__(self, readings: MeterReadings, tariff: Tariff) -> None:
+        """Initialize."""
+        self.readings = readings
+        self.tariff = tariff
+        self.cost = array("d")
+        self.cumulative = array("d")
+
+    def invalidate(self, start: float | None = None) -> None:
+        """Drop the costs of readings at or after start, or all of them."""
+        lo = 0 if start is None else self.readings.bounds(start)[0]
+        del self.cost[lo:]
+        del self.cumulative[lo:]
+
+    def set_tariff(self, tariff: Tariff) -> None:
+        """Price the readings with a different tariff."""
+        if tariff != self.tariff:
+            self.tariff = tariff
+            self.invalidate()
+
+    def update(self) -> None:
+        """Compute the costs of readings not priced yet."""
+        lo = len(self.cost)
+        hi = len(self.readings)
+        if lo >= hi:
+            return
+        periods = self.tariff.periods
+        timestamps = self.readings.timestamps
+        # Continue from the period and offset of the last priced reading.
+        anchor = timestamps[lo - 1] if lo else timestamps[0]
+        index = self.tariff.index_at(anchor)
+        rate = self.tariff.period_at(anchor).volumetric_rate
+        offset = (
+            self.cumulative[lo - 1] - self.readings.reads[lo - 1] * rate if lo else 0.0
+        )
+        following = periods[index + 1].start if index + 1 < len(periods) else None
+        for timestamp, consumption, read in self.readings.slice(lo, hi):
+            while following is not None and timestamp >= following:
+                # Keep the series continuous at the meter read where the
+                # hour priced at the new rate started.
+                index += 1
+                previous_rate = rate
+                rate = periods[index].volumetric_rate
+                offset += (read - consumption / 1000) * (previous_rate - rate)
+                following = (
+                    periods[index + 1].start if index + 1 < len(periods) else None
+                )
+            self.cost.append(consumption * (rate / 1000))
+            self.cumulative.append(read * rate + offset)
+
+    @property
+    def latest_cumulative(self) -> float:
+        """Return the cumulative cost at the newest reading."""
+        self.update()
+        return self.cumulative[-1] if self.cumulative else 0.0
+
+    def cost_between(self, start: float | None, end: float | None) -> float:
+        """Return the volumetric cost of readings in [start, end)."""
+        self.update()
+        lo, hi = self.readings.bounds(start, end)
+        if hi <= lo:
+            return 0.0
+        return self.cumulative[hi - 1] - self.cumulative[lo] + self.cost[lo]
@@ -0,0 +1,140 @@
+"""Access token lifecycle for Anglian Water accounts."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+from pyanglianwater.exceptions import ExpiredAccessTokenError
+
+from .const import LOGGER
+from .session import AnglianWaterAuth
+
+# Refresh the access token this long before it expires.
+REFRESH_MARGIN = timedelta(minutes=5)
+
+
+class AnglianWaterTokenManager:
+    """Keep an account's access token valid with as few logins as possible.
+
+    The manager outlives config entry reloads, so a reload reuses the
+    access token it already holds. An expiring token is renewed with the
+    refresh token ahead of time, and the full username and password
+    login only runs when the refresh token is rejected.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        auth: AnglianWaterAuth,
+        credentials: tuple[str | None, ...],
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.auth = auth
+        self.credentials = credentials
+        self.logins = 0
+        self.refreshes = 0
+        self._entry: ConfigEntry | None = None
+        self._lock = asyncio.Lock()
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+
+    @property
+    def expires(self) -> datetime | None:
+        """Return when the access token expires."""
+        if self.auth.access_token is None or self.auth.next_refresh is None:
+            return None
+        # The library stores a naive local time.
+        return dt_util.as_local(self.auth.next_refresh)
+
+    @property
+    def token_valid(self) -> bool:
+        """Return True if the access token is usable beyond the margin."""
+        expires = self.expires
+        return expires is not None and expires - REFRESH_MARGIN > dt_util.now()
+
+    async def _async_refresh(self) -> bool:
+        """Renew the access token with the refresh token."""
+        if self.auth.refresh_token is None:
+            return False
+        # The library only refreshes once the token has expired.
+        self.auth.next_refresh = None
+        await self.auth.send_refresh_request()
+        self.refreshes += 1
+        return self.auth.access_token is not None and self.expires is not None
+
+    async def _async_login(self) -> None:
+        """Run the full username and password login."""
+        LOGGER.debug("Refresh token rejected, logging in with password")
+        self.auth._refresh_token = None
+        self.auth.auth_data = None
+        self.auth.next_refresh = None
+        # Stale B2C cookies on the shared session can derail a new login.
+        self.auth._auth_session.cookie_jar.clear()
+        await self.auth.send_login_request()
+        self.logins += 1
+        if self.auth.access_token is None:
+            raise ExpiredAccessTokenError("Login did not return an access token")
+
+    async def async_ensure_token(self) -> None:
+        """Make sure the access token is valid, logging in if needed."""
+        async with self._lock:
+            if self.token_valid:
+                return
+            if not await self._async_refresh():
+                await self._async_login()
+            self._async_save_refresh_token()
+            self._async_schedule_refresh()
+
+    @callback
+    def _async_save_refresh_token(self) -> None:
+        """Store a changed refresh token on the config entry."""
+        entry = self._entry
+        if entry is None or self.auth.refresh_token is None:
+            return
+        if entry.data.get(CONF_ACCESS_TOKEN) == self.auth.refresh_token:
+            return
+        self.hass.config_entries.async_update_entry(
+            entry,
+            data={**entry.data, CONF_ACCESS_TOKEN: self.auth.refresh_token},
+        )
+
+    @callback
+    def _async_schedule_refresh(self) -> None:
+        """Renew the token in the background shortly before it expires."""
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+        if self._entry is None or (expires := self.expires) is None:
+            return
+        self._unsub_refresh = async_track_point_in_time(
+            self.hass, self._async_handle_refresh, expires - REFRESH_MARGIN
+        )
+
+    async def _async_handle_refresh(self, _now: datetime) -> None:
+        """Renew the token when the refresh timer fires."""
+        self._unsub_refresh = None
+        try:
+            await self.async_ensure_token()
+        except Exception as exception:
+            LOGGER.warning("Unable to refresh Anglian Water token: %s", exception)
+
+    @callback
+    def async_start(self, entry: ConfigEntry) -> None:
+        """Keep the token of a loaded entry fresh."""
+        self._entry = entry
+        self._async_save_refresh_token()
+        self._async_schedule_refresh()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop refreshing the token when the entry unloads."""
+        self._entry = None
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None